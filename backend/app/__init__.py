@@ -6,4 +6,17 @@ This package contains the main FastAPI application for the LightRAG conversation
 
 __version__ = "1.0.0"
 __author__ = "LightRAG Agent Team"
-__description__ = "A conversational AI agent powered by LightRAG for document-based knowledge graphs" 
\ No newline at end of file
+__description__ = "A conversational AI agent powered by LightRAG for document-based knowledge graphs"
+
+
+def __getattr__(name: str):
+    """
+    Lazily expose the LightRAG service singleton as `app.lightrag_service`.
+
+    Importing the service loads LightRAG and its model bindings, so it is
+    deferred until the attribute is first accessed.
+    """
+    if name == "lightrag_service":
+        from app.services.lightrag_service import lightrag_service
+        return lightrag_service
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,172 +3,161 @@ Application Settings Configuration
 
 This module manages all configuration settings for the LightRAG Agent application,
 including environment variables, database connections, and API configurations.
-Uses Pydantic Settings for type validation and environment variable loading.
+Uses a frozen msgspec Struct for typed settings; values are loaded from the
+process environment and an optional `.env` file by `build_settings()`.
+Directories referenced by the settings are created separately by
+`ensure_runtime_dirs()` during application startup.
 """
 
 import os
-from typing import List, Optional
-from pydantic import Field
-from pydantic_settings import BaseSettings
+from functools import cached_property, lru_cache
+from pathlib import Path
+from typing import Annotated, Any, Dict, List, Optional, get_args, get_origin
 
+import msgspec
+from dotenv import dotenv_values
+from msgspec import Meta
 
-class Settings(BaseSettings):
+
+ENV_FILE = ".env"
+ENV_FILE_ENCODING = "utf-8"
+
+# String values accepted for boolean settings (compared case-insensitively)
+_BOOL_VALUES = {
+    "1": True, "true": True, "yes": True, "on": True,
+    "0": False, "false": False, "no": False, "off": False,
+}
+
+
+class Settings(msgspec.Struct, frozen=True, kw_only=True, dict=True):
     """
     Application settings with environment variable support.
-    
+
     All settings can be overridden via environment variables.
     Example: DATABASE_URL=postgresql://... python app.py
     """
-    
+
     # Application settings
-    APP_NAME: str = Field(default="LightRAG Agent", description="Application name")
-    VERSION: str = Field(default="1.0.0", description="Application version")
-    ENVIRONMENT: str = Field(default="development", description="Environment (development, production, testing)")
-    DEBUG: bool = Field(default=True, description="Enable debug mode")
-    
+    APP_NAME: Annotated[str, Meta(description="Application name")] = "LightRAG Agent"
+    VERSION: Annotated[str, Meta(description="Application version")] = "1.0.0"
+    ENVIRONMENT: Annotated[str, Meta(description="Environment (development, production, testing)")] = "development"
+    DEBUG: Annotated[bool, Meta(description="Enable debug mode")] = True
+
     # Server configuration
-    HOST: str = Field(default="0.0.0.0", description="Server host")
-    PORT: int = Field(default=8000, description="Server port")
-    
+    HOST: Annotated[str, Meta(description="Server host")] = "0.0.0.0"
+    PORT: Annotated[int, Meta(description="Server port")] = 8000
+
     # CORS settings
-    ALLOWED_ORIGINS: List[str] = Field(
-        default=["http://localhost:3000", "http://127.0.0.1:3000", "http://localhost:8000"],
-        description="Allowed CORS origins"
+    ALLOWED_ORIGINS: Annotated[List[str], Meta(description="Allowed CORS origins")] = msgspec.field(
+        default_factory=lambda: ["http://localhost:3000", "http://127.0.0.1:3000", "http://localhost:8000"]
     )
-    
+
     # Database settings
-    NEO4J_URI: str = Field(default="bolt://localhost:7687", description="Neo4j database URI")
-    NEO4J_USER: str = Field(default="neo4j", description="Neo4j username")
-    NEO4J_PASSWORD: str = Field(default="password", description="Neo4j password")
-    NEO4J_DATABASE: str = Field(default="neo4j", description="Neo4j database name")
-    
+    NEO4J_URI: Annotated[str, Meta(description="Neo4j database URI")] = "bolt://localhost:7687"
+    NEO4J_USER: Annotated[str, Meta(description="Neo4j username")] = "neo4j"
+    NEO4J_PASSWORD: Annotated[str, Meta(description="Neo4j password")] = "password"
+    NEO4J_DATABASE: Annotated[str, Meta(description="Neo4j database name")] = "neo4j"
+
     # Redis settings
-    REDIS_URL: str = Field(default="redis://localhost:6379", description="Redis connection URL")
-    REDIS_PASSWORD: Optional[str] = Field(default=None, description="Redis password")
-    REDIS_DB: int = Field(default=0, description="Redis database number")
-    
+    REDIS_URL: Annotated[str, Meta(description="Redis connection URL")] = "redis://localhost:6379"
+    REDIS_PASSWORD: Annotated[Optional[str], Meta(description="Redis password")] = None
+    REDIS_DB: Annotated[int, Meta(description="Redis database number")] = 0
+    REDIS_CONNECT_TIMEOUT: Annotated[float, Meta(description="Seconds to wait for a Redis connection")] = 0.5
+    REDIS_SOCKET_TIMEOUT: Annotated[float, Meta(description="Seconds to wait for a Redis command reply")] = 1.0
+
     # OpenAI API settings
-    OPENAI_API_KEY: str = Field(description="OpenAI API key for LLM and embeddings")
-    OPENAI_MODEL: str = Field(default="gpt-4o-mini", description="OpenAI model for text generation")
-    OPENAI_EMBEDDING_MODEL: str = Field(
-        default="text-embedding-3-small", 
-        description="OpenAI model for embeddings"
-    )
-    OPENAI_MAX_TOKENS: int = Field(default=4096, description="Maximum tokens for OpenAI responses")
-    OPENAI_TEMPERATURE: float = Field(default=0.7, description="Temperature for OpenAI responses")
-    
+    OPENAI_API_KEY: Annotated[str, Meta(description="OpenAI API key for LLM and embeddings")]
+    OPENAI_MODEL: Annotated[str, Meta(description="OpenAI model for text generation")] = "gpt-4o-mini"
+    OPENAI_EMBEDDING_MODEL: Annotated[str, Meta(description="OpenAI model for embeddings")] = "text-embedding-3-small"
+    OPENAI_MAX_TOKENS: Annotated[int, Meta(description="Maximum tokens for OpenAI responses")] = 4096
+    OPENAI_TEMPERATURE: Annotated[float, Meta(description="Temperature for OpenAI responses")] = 0.7
+
     # Anthropic API settings (optional)
-    ANTHROPIC_API_KEY: Optional[str] = Field(default=None, description="Anthropic API key")
-    ANTHROPIC_MODEL: str = Field(default="claude-3-5-sonnet-20241022", description="Anthropic model")
-    
+    ANTHROPIC_API_KEY: Annotated[Optional[str], Meta(description="Anthropic API key")] = None
+    ANTHROPIC_MODEL: Annotated[str, Meta(description="Anthropic model")] = "claude-3-5-sonnet-20241022"
+
     # LightRAG configuration
-    LIGHTRAG_WORKING_DIR: str = Field(default="./lightrag_data", description="LightRAG working directory")
-    LIGHTRAG_MODEL: str = Field(default="gpt-4o-mini", description="LightRAG model for processing")
-    LIGHTRAG_EMBEDDING_MODEL: str = Field(
-        default="text-embedding-3-small", 
-        description="LightRAG embedding model"
-    )
-    LIGHTRAG_MAX_ASYNC: int = Field(default=4, description="Maximum async operations for LightRAG")
-    LIGHTRAG_MAX_TOKENS: int = Field(default=32768, description="Maximum tokens for LightRAG")
-    
+    LIGHTRAG_WORKING_DIR: Annotated[str, Meta(description="LightRAG working directory")] = "./lightrag_data"
+    LIGHTRAG_MODEL: Annotated[str, Meta(description="LightRAG model for processing")] = "gpt-4o-mini"
+    LIGHTRAG_EMBEDDING_MODEL: Annotated[str, Meta(description="LightRAG embedding model")] = "text-embedding-3-small"
+    LIGHTRAG_MAX_ASYNC: Annotated[int, Meta(description="Maximum async operations for LightRAG")] = 4
+    LIGHTRAG_MAX_TOKENS: Annotated[int, Meta(description="Maximum tokens for LightRAG")] = 32768
+
     # Document processing settings
-    CHUNK_SIZE: int = Field(default=512, description="Text chunk size for processing")
-    CHUNK_OVERLAP: int = Field(default=50, description="Overlap between text chunks")
-    MAX_UPLOAD_SIZE: int = Field(default=10 * 1024 * 1024, description="Maximum upload size (10MB)")
-    ALLOWED_FILE_TYPES: List[str] = Field(
-        default=[".docx", ".pdf", ".txt", ".md"],
-        description="Allowed file types for upload"
+    CHUNK_SIZE: Annotated[int, Meta(description="Text chunk size for processing")] = 512
+    CHUNK_OVERLAP: Annotated[int, Meta(description="Overlap between text chunks")] = 50
+    MAX_UPLOAD_SIZE: Annotated[int, Meta(description="Maximum upload size (10MB)")] = 10 * 1024 * 1024
+    ALLOWED_FILE_TYPES: Annotated[List[str], Meta(description="Allowed file types for upload")] = msgspec.field(
+        default_factory=lambda: [".docx", ".pdf", ".txt", ".md"]
     )
-    UPLOAD_DIR: str = Field(default="./uploads", description="Directory for uploaded files")
-    
+    UPLOAD_DIR: Annotated[str, Meta(description="Directory for uploaded files")] = "./uploads"
+    MAX_STORED_DOCUMENTS: Annotated[int, Meta(description="Maximum documents kept in the in-memory store")] = 10_000
+
     # Logging settings
-    LOG_LEVEL: str = Field(default="INFO", description="Logging level")
-    LOG_FORMAT: str = Field(
-        default="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-        description="Log format"
+    LOG_LEVEL: Annotated[str, Meta(description="Logging level")] = "INFO"
+    LOG_FORMAT: Annotated[str, Meta(description="Log format")] = (
+        "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
     )
-    LOG_FILE: Optional[str] = Field(default="logs/app.log", description="Log file path")
-    
+    LOG_FILE: Annotated[Optional[str], Meta(description="Log file path")] = "logs/app.log"
+
     # Security settings
-    SECRET_KEY: str = Field(
-        default="your-secret-key-change-in-production", 
-        description="Secret key for JWT and encryption"
-    )
-    ALGORITHM: str = Field(default="HS256", description="JWT algorithm")
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=30, description="Access token expiration time")
-    
+    SECRET_KEY: Annotated[str, Meta(description="Secret key for JWT and encryption")] = "your-secret-key-change-in-production"
+    ALGORITHM: Annotated[str, Meta(description="JWT algorithm")] = "HS256"
+    ACCESS_TOKEN_EXPIRE_MINUTES: Annotated[int, Meta(description="Access token expiration time")] = 30
+
     # Rate limiting settings
-    RATE_LIMIT_REQUESTS: int = Field(default=100, description="Rate limit requests per minute")
-    RATE_LIMIT_WINDOW: int = Field(default=60, description="Rate limit window in seconds")
-    
+    RATE_LIMIT_REQUESTS: Annotated[int, Meta(description="Rate limit requests per minute")] = 100
+    RATE_LIMIT_WINDOW: Annotated[int, Meta(description="Rate limit window in seconds")] = 60
+
     # WebSocket settings
-    WS_MAX_CONNECTIONS: int = Field(default=100, description="Maximum WebSocket connections")
-    WS_HEARTBEAT_INTERVAL: int = Field(default=30, description="WebSocket heartbeat interval")
-    
+    WS_MAX_CONNECTIONS: Annotated[int, Meta(description="Maximum WebSocket connections")] = 100
+    WS_HEARTBEAT_INTERVAL: Annotated[int, Meta(description="WebSocket heartbeat interval")] = 30
+
     # Vector database settings
-    VECTOR_DB_TYPE: str = Field(default="chroma", description="Vector database type (chroma, faiss)")
-    CHROMA_PERSIST_DIR: str = Field(default="./chroma_db", description="ChromaDB persistence directory")
-    CHROMA_COLLECTION_NAME: str = Field(default="lightrag", description="ChromaDB collection name")
-    
+    VECTOR_DB_TYPE: Annotated[str, Meta(description="Vector database type (chroma, faiss)")] = "chroma"
+    CHROMA_PERSIST_DIR: Annotated[str, Meta(description="ChromaDB persistence directory")] = "./chroma_db"
+    CHROMA_COLLECTION_NAME: Annotated[str, Meta(description="ChromaDB collection name")] = "lightrag"
+
     # Knowledge graph settings
-    ENABLE_GRAPH_VISUALIZATION: bool = Field(default=True, description="Enable graph visualization endpoints")
-    MAX_GRAPH_NODES: int = Field(default=1000, description="Maximum nodes in graph visualization")
-    
+    ENABLE_GRAPH_VISUALIZATION: Annotated[bool, Meta(description="Enable graph visualization endpoints")] = True
+    MAX_GRAPH_NODES: Annotated[int, Meta(description="Maximum nodes in graph visualization")] = 1000
+
     # Cache settings
-    CACHE_TTL: int = Field(default=3600, description="Cache TTL in seconds")
-    ENABLE_QUERY_CACHE: bool = Field(default=True, description="Enable query result caching")
-    
+    CACHE_TTL: Annotated[int, Meta(description="Cache TTL in seconds")] = 3600
+    ENABLE_QUERY_CACHE: Annotated[bool, Meta(description="Enable query result caching")] = True
+    KB_STATS_CACHE_TTL: Annotated[int, Meta(description="Knowledge base stats cache TTL in seconds")] = 30
+    EXTRACTION_CACHE_MAX_CHARS: Annotated[int, Meta(description="Total characters of extracted upload text kept for re-uploads of identical files")] = 20_000_000
+    ENABLE_REDIS_KB_STORE: Annotated[bool, Meta(description="Persist knowledge bases in Redis")] = False
+    KB_CACHE_TTL: Annotated[int, Meta(description="Seconds before the local knowledge base cache is reloaded from Redis")] = 5
+
     # Background task settings
-    CELERY_BROKER_URL: Optional[str] = Field(default=None, description="Celery broker URL for background tasks")
-    CELERY_RESULT_BACKEND: Optional[str] = Field(default=None, description="Celery result backend")
-    
-    class Config:
-        """Pydantic configuration."""
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = True
-        extra = "ignore"
-        
-    def __init__(self, **kwargs):
-        """Initialize settings and create necessary directories."""
-        super().__init__(**kwargs)
-        
-        # Create necessary directories
-        os.makedirs(self.UPLOAD_DIR, exist_ok=True)
-        os.makedirs(self.LIGHTRAG_WORKING_DIR, exist_ok=True)
-        os.makedirs(self.CHROMA_PERSIST_DIR, exist_ok=True)
-        
-        # Create logs directory if log file is specified
-        if self.LOG_FILE:
-            log_dir = os.path.dirname(self.LOG_FILE)
-            if log_dir:
-                os.makedirs(log_dir, exist_ok=True)
-
-    @property
+    CELERY_BROKER_URL: Annotated[Optional[str], Meta(description="Celery broker URL for background tasks")] = None
+    CELERY_RESULT_BACKEND: Annotated[Optional[str], Meta(description="Celery result backend")] = None
+
+    # Derived values are computed on first access and stored in the instance
+    # __dict__ (enabled by dict=True); settings are immutable, so they never go stale.
+
+    @cached_property
     def database_url(self) -> str:
         """Get formatted database URL for SQLAlchemy."""
         return f"neo4j://{self.NEO4J_USER}:{self.NEO4J_PASSWORD}@{self.NEO4J_URI.replace('bolt://', '')}"
-    
-    @property
+
+    @cached_property
     def redis_config(self) -> dict:
         """Get Redis configuration dictionary."""
         config = {
             "url": self.REDIS_URL,
             "db": self.REDIS_DB,
-            "decode_responses": True
+            "decode_responses": True,
+            "socket_connect_timeout": self.REDIS_CONNECT_TIMEOUT,
+            "socket_timeout": self.REDIS_SOCKET_TIMEOUT
         }
         if self.REDIS_PASSWORD:
             config["password"] = self.REDIS_PASSWORD
         return config
-    
-    @property
-    def cors_origins(self) -> List[str]:
-        """Get CORS origins, handling both string and list formats."""
-        if isinstance(self.ALLOWED_ORIGINS, str):
-            return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
-        return self.ALLOWED_ORIGINS
-    
-    def get_openai_config(self) -> dict:
+
+    @cached_property
+    def openai_config(self) -> dict:
         """Get OpenAI configuration dictionary."""
         return {
             "api_key": self.OPENAI_API_KEY,
@@ -177,8 +166,9 @@ class Settings(BaseSettings):
             "max_tokens": self.OPENAI_MAX_TOKENS,
             "temperature": self.OPENAI_TEMPERATURE
         }
-    
-    def get_lightrag_config(self) -> dict:
+
+    @cached_property
+    def lightrag_config(self) -> dict:
         """Get LightRAG configuration dictionary."""
         return {
             "working_dir": self.LIGHTRAG_WORKING_DIR,
@@ -189,37 +179,143 @@ class Settings(BaseSettings):
             "chunk_size": self.CHUNK_SIZE,
             "chunk_overlap": self.CHUNK_OVERLAP
         }
-    
-    @property
-    def lightrag_data_dir(self) -> str:
-        """Get LightRAG data directory path."""
-        return self.LIGHTRAG_WORKING_DIR
-    
-    @property
-    def neo4j_uri(self) -> str:
-        """Get Neo4j URI."""
-        return self.NEO4J_URI
-    
-    @property
-    def neo4j_username(self) -> str:
-        """Get Neo4j username."""
-        return self.NEO4J_USER
-    
-    @property
-    def neo4j_password(self) -> str:
-        """Get Neo4j password."""
-        return self.NEO4J_PASSWORD
-    
-    @property
-    def redis_url(self) -> str:
-        """Get Redis URL."""
-        return self.REDIS_URL
-    
-    @property
-    def chromadb_host(self) -> str:
-        """Get ChromaDB host (for compatibility)."""
-        return "localhost"  # ChromaDB is local in our setup
-
-
-# Create global settings instance
-settings = Settings() 
\ No newline at end of file
+
+
+def _load_env_values(env_file: Optional[str] = ENV_FILE) -> Dict[str, Any]:
+    """
+    Collect raw setting values from the `.env` file and the process environment.
+
+    Process environment variables take precedence over `.env` entries. Only keys
+    matching a Settings field are kept (case-sensitive); unknown keys are ignored.
+    String values for list fields (e.g. ALLOWED_ORIGINS) are normalized here,
+    once, accepting either a JSON array or a comma-separated list. Boolean
+    fields accept 1/0, true/false, yes/no and on/off in any case; other
+    strings are left for `msgspec.convert` to reject.
+
+    Args:
+        env_file: Path to the dotenv file, or None to skip it
+
+    Returns:
+        Dict mapping field names to raw values ready for `msgspec.convert`
+    """
+    raw: Dict[str, Any] = {}
+    if env_file and os.path.isfile(env_file):
+        raw.update(dotenv_values(env_file, encoding=ENV_FILE_ENCODING))
+    raw.update(os.environ)
+
+    values: Dict[str, Any] = {}
+    for field in msgspec.structs.fields(Settings):
+        value = raw.get(field.name)
+        if value is None:
+            continue
+        field_type = field.type
+        if get_origin(field_type) is Annotated:
+            field_type = get_args(field_type)[0]
+        if get_origin(field_type) is list and isinstance(value, str):
+            value = _parse_list_value(value)
+        elif field_type is bool and isinstance(value, str):
+            value = _BOOL_VALUES.get(value.strip().lower(), value)
+        values[field.name] = value
+    return values
+
+
+def _parse_list_value(value: str) -> List[str]:
+    """
+    Parse a list setting given as a JSON array or a comma-separated string.
+
+    Args:
+        value: Raw environment value
+
+    Returns:
+        List of non-empty, stripped items
+    """
+    if value.lstrip().startswith("["):
+        return msgspec.json.decode(value)
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def build_settings(env_file: Optional[str] = ENV_FILE) -> Settings:
+    """
+    Load settings from the environment.
+
+    This has no filesystem side effects; see `ensure_runtime_dirs()`.
+
+    Args:
+        env_file: Path to the dotenv file, or None to skip it
+
+    Returns:
+        Validated Settings instance
+    """
+    return msgspec.convert(_load_env_values(env_file), Settings, strict=False)
+
+
+def ensure_runtime_dirs(settings: Settings) -> None:
+    """
+    Create the directories referenced by the settings if they are missing.
+
+    Called once from the FastAPI lifespan startup rather than on every
+    settings load.
+
+    Args:
+        settings: Settings whose directories should exist
+    """
+    runtime_dirs = [settings.UPLOAD_DIR, settings.LIGHTRAG_WORKING_DIR, settings.CHROMA_PERSIST_DIR]
+
+    # Create logs directory if log file is specified
+    if settings.LOG_FILE:
+        runtime_dirs.append(os.path.dirname(settings.LOG_FILE))
+
+    for directory in runtime_dirs:
+        if directory:
+            Path(directory).mkdir(parents=True, exist_ok=True)
+
+
+def lightrag_data_dir(settings: Settings) -> str:
+    """Get LightRAG data directory path."""
+    return settings.LIGHTRAG_WORKING_DIR
+
+
+def neo4j_uri(settings: Settings) -> str:
+    """Get Neo4j URI."""
+    return settings.NEO4J_URI
+
+
+def neo4j_username(settings: Settings) -> str:
+    """Get Neo4j username."""
+    return settings.NEO4J_USER
+
+
+def neo4j_password(settings: Settings) -> str:
+    """Get Neo4j password."""
+    return settings.NEO4J_PASSWORD
+
+
+def redis_url(settings: Settings) -> str:
+    """Get Redis URL."""
+    return settings.REDIS_URL
+
+
+def chromadb_host(settings: Settings) -> str:
+    """Get ChromaDB host (for compatibility)."""
+    return "localhost"  # ChromaDB is local in our setup
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the process-wide settings instance.
+
+    The environment is parsed on the first call only; every later call
+    returns the same cached instance.
+
+    Returns:
+        Shared Settings instance
+    """
+    return build_settings()
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve the legacy module-level `settings` attribute lazily."""
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,33 @@
+"""
+FastAPI Dependencies
+
+Shared dependencies for the API routers.
+"""
+
+from fastapi import HTTPException, status
+from lightrag import LightRAG
+
+from app.services.lightrag_service import lightrag_service
+
+
+async def get_rag() -> LightRAG:
+    """
+    Provide the shared, initialized LightRAG instance.
+
+    LightRAG is initialized once during application startup, so after warmup
+    this only checks a flag. If startup initialization failed, it is retried
+    here before giving up. Handlers pass the instance to the service methods,
+    which no longer initialize LightRAG themselves.
+
+    Returns:
+        The initialized LightRAG instance
+
+    Raises:
+        HTTPException: 503 if LightRAG cannot be initialized
+    """
+    if not await lightrag_service.initialize():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Knowledge graph service is unavailable"
+        )
+    return lightrag_service.rag
@@ -6,176 +6,314 @@ knowledge graph construction, and real-time chat capabilities.
 
 This implementation follows patterns from the ottomator-agents light-rag-agent example
 and integrates with the HKUDS/LightRAG repository for core functionality.
+
+Startup is split in two phases: `create_app()` builds a lightweight app (CORS,
+exception handlers, health probes) that can accept connections immediately, and
+`_deferred_init()` runs in the background after the lifespan startup to import
+and mount the business routers. `/health/ready` returns 503 until it finishes.
 """
 
+import asyncio
+import inspect
 import logging
 import os
+import sys
 from contextlib import asynccontextmanager
-from typing import Dict
+from typing import Any, Callable, Dict, List, Tuple
 
-from fastapi import FastAPI, HTTPException
+from fastapi import APIRouter, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from loguru import logger
 
-from app.config.settings import settings
-from app.routers import chat, documents, knowledge_base
+from app.config.settings import ensure_runtime_dirs, get_settings
 from app.utils.logging import setup_logging
 
+settings = get_settings()
+
+# Request headers allowed on cross-origin calls; an explicit list lets Starlette answer
+# preflights from a fixed header set instead of echoing the request headers
+CORS_ALLOW_HEADERS = ("authorization", "content-type", "x-requested-with")
+
+# Let browsers cache preflight responses for a day
+CORS_PREFLIGHT_MAX_AGE = 86400
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     FastAPI lifespan context manager for startup and shutdown events.
-    
+
     This handles:
     - Application startup initialization
+    - Scheduling deferred initialization (routers, services)
     - Database connections
-    - Redis connections  
+    - Redis connections
     - LightRAG initialization
     - Cleanup on shutdown
     """
     # Startup
     logger.info("Starting LightRAG Agent application...")
-    
+
+    # Create upload, data and log directories
+    ensure_runtime_dirs(settings)
+
     # Initialize logging
     setup_logging()
-    
-    # Initialize database connections
-    # TODO: Initialize Neo4j connection
-    # TODO: Initialize Redis connection
-    # TODO: Initialize LightRAG service
-    
-    logger.info("Application startup complete")
-    
+
+    # Heavy initialization runs in the background so the server can bind its
+    # socket and answer liveness probes right away
+    app.state.init_task = asyncio.create_task(_deferred_init(app))
+
+    logger.info("Application startup complete (deferred initialization scheduled)")
+
     yield
-    
+
     # Shutdown
     logger.info("Shutting down LightRAG Agent application...")
+    init_task = app.state.init_task
+    if not init_task.done():
+        init_task.cancel()
+    # Let deferred initialization stop before releasing what it created
+    await asyncio.gather(init_task, return_exceptions=True)
+    await _shutdown_services()
     # TODO: Close database connections
     # TODO: Cleanup resources
     logger.info("Application shutdown complete")
+    
+    # Flush records still queued for the enqueued sinks
+    await logger.complete()
 
 
-# Create FastAPI application instance
-app = FastAPI(
-    title="LightRAG Agent API",
-    description="A conversational AI agent powered by LightRAG for document-based knowledge graphs",
-    version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc",
-    lifespan=lifespan
-)
-
-# Configure CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.ALLOWED_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["*"],
-    expose_headers=["*"]
-)
-
-
-# Global exception handlers
-@app.exception_handler(HTTPException)
-async def http_exception_handler(request, exc: HTTPException):
-    """Handle HTTP exceptions with consistent error response format."""
-    logger.error(f"HTTP {exc.status_code}: {exc.detail}")
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={
-            "error": exc.detail,
-            "status_code": exc.status_code,
-            "path": str(request.url.path)
-        }
-    )
+def _shutdown_steps() -> List[Tuple[str, Callable[[], Any]]]:
+    """
+    Collect the cleanup calls for the modules that were actually imported.
 
+    Looking modules up in `sys.modules` keeps shutdown from importing the
+    heavy router and service modules just to close resources never opened.
 
-@app.exception_handler(Exception)
-async def general_exception_handler(request, exc: Exception):
-    """Handle unexpected exceptions with error logging."""
-    logger.error(f"Unexpected error: {exc}", exc_info=True)
-    return JSONResponse(
-        status_code=500,
-        content={
-            "error": "Internal server error",
-            "status_code": 500,
-            "path": str(request.url.path)
-        }
-    )
+    Returns:
+        List of (resource name, cleanup callable) pairs in shutdown order
+    """
+    steps: List[Tuple[str, Callable[[], Any]]] = []
+    documents = sys.modules.get("app.routers.documents")
+    if documents is not None:
+        steps.append(("extraction pool", documents.shutdown_extraction_pool))
+    query_cache = sys.modules.get("app.services.query_cache")
+    if query_cache is not None:
+        steps.append(("query cache", query_cache.query_cache.close))
+    knowledge_base = sys.modules.get("app.routers.knowledge_base")
+    if knowledge_base is not None:
+        steps.append(("knowledge base repository", knowledge_base.kb_repo.close))
+    lightrag = sys.modules.get("app.services.lightrag_service")
+    if lightrag is not None:
+        steps.append(("LightRAG", lightrag.lightrag_service.finalize))
+    return steps
 
 
-# Health check endpoint
-@app.get("/health", tags=["Health"])
-async def health_check() -> Dict[str, str]:
+async def _shutdown_services() -> None:
     """
-    Health check endpoint to verify the application is running.
-    
-    Returns:
-        Dict containing application status and version
+    Release pools, connections and storages opened by routers and services.
+
+    Runs on every shutdown, including when deferred initialization failed or
+    was cancelled part-way. Every cleanup is a no-op for resources that were
+    never opened, and a failing cleanup does not skip the remaining ones.
     """
-    return {
-        "status": "healthy",
-        "version": "1.0.0",
-        "service": "lightrag-agent",
-        "environment": settings.ENVIRONMENT
-    }
+    for name, cleanup in _shutdown_steps():
+        try:
+            result = cleanup()
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.error("Failed to close {}: {}", name, e)
 
 
-@app.get("/", tags=["Root"])
-async def root() -> Dict[str, str]:
+def _load_routers() -> List[Tuple[APIRouter, str]]:
     """
-    Root endpoint with basic application information.
-    
+    Import the business router modules.
+
+    The router modules pull in LightRAG, the document parsers and their
+    Pydantic models. This runs in a worker thread so those imports do not
+    block the event loop.
+
     Returns:
-        Dict containing welcome message and API documentation links
+        List of (router, tag) pairs in mount order
     """
-    return {
-        "message": "Welcome to LightRAG Agent API",
-        "docs": "/docs",
-        "redoc": "/redoc",
-        "health": "/health"
-    }
-
-
-# Include API routers with correct prefixes
-# Note: Routers already define their own prefixes, so we don't add them here
-app.include_router(
-    chat.router,
-    tags=["Chat"]
-)
-
-app.include_router(
-    documents.router,
-    tags=["Documents"]
-)
-
-app.include_router(
-    knowledge_base.router,
-    tags=["Knowledge Base"]
-)
-
-
-# WebSocket endpoint for real-time chat
-@app.websocket("/ws/chat/{session_id}")
-async def websocket_chat_endpoint(websocket, session_id: str):
+    from app.routers import chat, documents, knowledge_base
+
+    return [
+        (chat.router, "Chat"),
+        (documents.router, "Documents"),
+        (knowledge_base.router, "Knowledge Base"),
+    ]
+
+
+async def _deferred_init(app: FastAPI) -> None:
     """
-    WebSocket endpoint for real-time chat communication.
-    
+    Second startup phase: import and mount routers, then mark the app ready.
+
     Args:
-        websocket: WebSocket connection
-        session_id: Unique session identifier for the chat
+        app: Running FastAPI application
+    """
+    try:
+        routers = await asyncio.to_thread(_load_routers)
+
+        # Note: Routers already define their own prefixes, so we don't add them here
+        for router, tag in routers:
+            app.include_router(router, tags=[tag])
+        # Drop any schema generated before the routers were mounted
+        app.openapi_schema = None
+
+        # Initialize LightRAG once so request handlers get a ready instance
+        # (see app.dependencies.get_rag); failures are retried on first use
+        from app.services.lightrag_service import lightrag_service
+        if not await lightrag_service.initialize():
+            logger.warning("LightRAG initialization failed at startup; will retry on first request")
+        
+        # Initialize database connections
+        # TODO: Initialize Neo4j connection
+        # TODO: Initialize Redis connection
+
+        app.state.ready_event.set()
+        logger.info("Deferred initialization complete - application ready")
+
+    except Exception as e:
+        logger.exception("Deferred initialization failed: {}", e)
+
+
+def create_app() -> FastAPI:
+    """
+    Build the FastAPI application without importing the business routers.
+
+    Returns:
+        FastAPI application with middleware, exception handlers and health probes
     """
-    # TODO: Implement WebSocket chat handler
-    # This will be implemented in the chat router
-    pass
+    app = FastAPI(
+        title="LightRAG Agent API",
+        description="A conversational AI agent powered by LightRAG for document-based knowledge graphs",
+        version="1.0.0",
+        docs_url="/docs",
+        redoc_url="/redoc",
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan
+    )
+    app.state.ready_event = asyncio.Event()
+
+    # Configure CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.ALLOWED_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+        allow_headers=CORS_ALLOW_HEADERS,
+        expose_headers=["*"],
+        max_age=CORS_PREFLIGHT_MAX_AGE
+    )
+
+    # Global exception handlers
+    @app.exception_handler(HTTPException)
+    async def http_exception_handler(request, exc: HTTPException):
+        """Handle HTTP exceptions with consistent error response format."""
+        logger.error("HTTP {}: {}", exc.status_code, exc.detail)
+        return ORJSONResponse(
+            status_code=exc.status_code,
+            content={
+                "error": exc.detail,
+                "status_code": exc.status_code,
+                "path": str(request.url.path)
+            }
+        )
+
+    @app.exception_handler(Exception)
+    async def general_exception_handler(request, exc: Exception):
+        """Handle unexpected exceptions with error logging."""
+        logger.opt(exception=exc).error("Unexpected error: {}", exc)
+        return ORJSONResponse(
+            status_code=500,
+            content={
+                "error": "Internal server error",
+                "status_code": 500,
+                "path": str(request.url.path)
+            }
+        )
+
+    # Health check endpoint
+    @app.get("/health", tags=["Health"])
+    async def health_check() -> Dict[str, str]:
+        """
+        Health check endpoint to verify the application is running.
+
+        Returns:
+            Dict containing application status and version
+        """
+        return {
+            "status": "healthy",
+            "version": "1.0.0",
+            "service": "lightrag-agent",
+            "environment": settings.ENVIRONMENT
+        }
+
+    @app.get("/health/live", tags=["Health"])
+    async def liveness_check() -> Dict[str, str]:
+        """
+        Liveness probe that does not depend on any router or service imports.
+
+        Returns:
+            Dict containing liveness status
+        """
+        return {"status": "alive"}
+
+    @app.get("/health/ready", tags=["Health"])
+    async def readiness_check():
+        """
+        Readiness probe that reports whether deferred initialization finished.
+
+        Returns:
+            Dict containing readiness status, or a 503 response while starting
+        """
+        if not app.state.ready_event.is_set():
+            return ORJSONResponse(status_code=503, content={"status": "starting"})
+        return {"status": "ready"}
+
+    @app.get("/", tags=["Root"])
+    async def root() -> Dict[str, str]:
+        """
+        Root endpoint with basic application information.
+
+        Returns:
+            Dict containing welcome message and API documentation links
+        """
+        return {
+            "message": "Welcome to LightRAG Agent API",
+            "docs": "/docs",
+            "redoc": "/redoc",
+            "health": "/health"
+        }
+
+    # WebSocket endpoint for real-time chat
+    @app.websocket("/ws/chat/{session_id}")
+    async def websocket_chat_endpoint(websocket, session_id: str):
+        """
+        WebSocket endpoint for real-time chat communication.
+
+        Args:
+            websocket: WebSocket connection
+            session_id: Unique session identifier for the chat
+        """
+        # TODO: Implement WebSocket chat handler
+        # This will be implemented in the chat router
+        pass
+
+    return app
+
+
+# Create FastAPI application instance
+app = create_app()
 
 
 if __name__ == "__main__":
     import uvicorn
-    
+
     # Run the application using uvicorn
     uvicorn.run(
         "app.main:app",
@@ -183,4 +321,4 @@ if __name__ == "__main__":
         port=8000,
         reload=True,
         log_level="info"
-    ) 
\ No newline at end of file
+    )
@@ -0,0 +1,31 @@
+"""
+Document Models
+
+Pydantic models describing uploaded documents. `DocumentInfo` instances are
+built once when a document is stored and returned as-is by the documents API.
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, field_serializer
+
+from app.utils.timestamps import isoformat_utc
+
+
+class DocumentInfo(BaseModel):
+    """Model for document information."""
+    model_config = ConfigDict(defer_build=True, revalidate_instances="never")
+
+    id: str
+    filename: str
+    content_type: str
+    size: int
+    text_length: int
+    status: str
+    upload_time: float  # epoch seconds; formatted to ISO 8601 on serialization
+    kb_id: Optional[str] = None  # knowledge base the document was uploaded to
+
+    @field_serializer("upload_time")
+    def _serialize_upload_time(self, upload_time: float) -> str:
+        """Format the stored epoch timestamp as ISO 8601 (UTC) on output."""
+        return isoformat_utc(upload_time)
@@ -0,0 +1,40 @@
+"""
+Knowledge Base Models
+
+Pydantic models describing knowledge bases. `KnowledgeBaseInfo` instances are
+built from the knowledge base store's columns when an API handler needs one.
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field, computed_field
+
+from app.utils.timestamps import isoformat_utc
+
+
+class KnowledgeBaseInfo(BaseModel):
+    """Knowledge base information model."""
+    model_config = ConfigDict(defer_build=True, revalidate_instances="never")
+
+    id: str
+    name: str
+    description: Optional[str] = None
+    # Epoch seconds; exposed as ISO 8601 through created_date / last_updated
+    created_ts: float = Field(exclude=True)
+    updated_ts: float = Field(exclude=True)
+    document_count: int = 0
+    entity_count: int = 0
+    relationship_count: int = 0
+    status: str  # active, inactive, processing
+
+    @computed_field
+    @property
+    def created_date(self) -> str:
+        """Creation time as ISO 8601 (UTC)."""
+        return isoformat_utc(self.created_ts)
+
+    @computed_field
+    @property
+    def last_updated(self) -> str:
+        """Last update time as ISO 8601 (UTC)."""
+        return isoformat_utc(self.updated_ts)
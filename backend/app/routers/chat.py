@@ -10,31 +10,44 @@ Features:
 - Simple and reliable chat interface
 """
 
-import logging
-from typing import Dict, Any
+from typing import Dict, Any, Literal
 
-from fastapi import APIRouter, HTTPException, status
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends
+from lightrag import LightRAG
+from pydantic import BaseModel, ConfigDict
+from loguru import logger
 
+from ..dependencies import get_rag
 from ..services.lightrag_service import query_knowledge_graph
+from ..utils.responses import MsgspecJSONResponse
 
-logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/chat", tags=["chat"])
 
+# LightRAG query modes accepted by the chat endpoint
+QueryMode = Literal["local", "global", "hybrid", "naive", "mix"]
+
 class ChatRequest(BaseModel):
     """Request model for chat queries."""
+    model_config = ConfigDict(defer_build=True)
+
     message: str
-    mode: str = "hybrid"  # local, global, hybrid, naive, mix
+    mode: QueryMode = "hybrid"
 
 class ChatResponse(BaseModel):
-    """Response model for chat queries."""
+    """Response model for chat queries (always built via model_construct)."""
+    model_config = ConfigDict(defer_build=True, revalidate_instances="never")
+
     response: str
     mode: str
     success: bool
 
-@router.post("/query", response_model=ChatResponse)
-async def chat_query(request: ChatRequest) -> ChatResponse:
+@router.post(
+    "/query",
+    response_model=ChatResponse,
+    response_class=MsgspecJSONResponse
+)
+async def chat_query(request: ChatRequest, rag: LightRAG = Depends(get_rag)) -> ChatResponse:
     """
     Process a chat query using LightRAG knowledge graph.
     
@@ -43,44 +56,37 @@ async def chat_query(request: ChatRequest) -> ChatResponse:
     
     Args:
         request: Chat request containing message and query mode
+        rag: Shared LightRAG instance (503 is returned if it is unavailable)
         
     Returns:
         ChatResponse with the generated answer
     """
     try:
-        logger.info(f"🔍 Processing chat query with mode '{request.mode}': {request.message[:100]}...")
+        logger.info("🔍 Processing chat query with mode '{}': {:.100}...", request.mode, request.message)
         
-        # Validate query mode
-        valid_modes = ["local", "global", "hybrid", "naive", "mix"]
-        if request.mode not in valid_modes:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid query mode. Must be one of: {valid_modes}"
-            )
+        # Query mode is validated by ChatRequest (invalid modes are rejected with 422)
         
         # Query LightRAG using official pattern
         response = await query_knowledge_graph(
+            rag,
             query=request.message,
             mode=request.mode
         )
         
-        logger.info(f"✅ Chat query completed successfully (response length: {len(response)} chars)")
+        logger.info("✅ Chat query completed successfully (response length: {} chars)", len(response))
         
-        return ChatResponse(
+        return ChatResponse.model_construct(
             response=response,
             mode=request.mode,
             success=True
         )
         
-    except HTTPException:
-        # Re-raise HTTP exceptions as-is
-        raise
     except Exception as e:
-        logger.error(f"❌ Chat query failed: {e}")
+        logger.error("❌ Chat query failed: {}", e)
         logger.exception("Full chat query error traceback:")
         
         # Return error response instead of raising exception
-        return ChatResponse(
+        return ChatResponse.model_construct(
             response=f"I apologize, but I encountered an error processing your request: {str(e)}",
             mode=request.mode,
             success=False
@@ -107,7 +113,7 @@ async def chat_health() -> Dict[str, Any]:
         }
         
     except Exception as e:
-        logger.error(f"❌ Chat health check failed: {e}")
+        logger.error("❌ Chat health check failed: {}", e)
         return {
             "status": "unhealthy",
             "service": "chat",
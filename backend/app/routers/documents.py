@@ -11,27 +11,68 @@ Features:
 - Document status tracking and retrieval
 """
 
-import logging
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
 import uuid
-from typing import List, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import BinaryIO, List, Dict, Any, Optional, Tuple
 from pathlib import Path
 import mimetypes
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, status
-from pydantic import BaseModel
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, status
+from pydantic import BaseModel, ConfigDict
+from loguru import logger
 
-from ..services.text_extraction_service import extract_text_from_file
+from ..config.settings import settings
+from ..dependencies import get_rag
+from ..services.text_extraction_service import extract_text_from_path
+from ..services.extraction_cache import extraction_cache
 from ..services.lightrag_service import insert_document
+from ..models.documents import DocumentInfo
+from ..services.document_store import DocumentStore
+from ..utils.responses import MsgspecJSONResponse
+from ..utils.timestamps import isoformat_utc
 
-logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/documents", tags=["documents"])
 
 # In-memory document store (replace with database in production)
-documents_db: Dict[str, Dict[str, Any]] = {}
+documents_db = DocumentStore(max_documents=settings.MAX_STORED_DOCUMENTS)
+
+# Uploads are copied to disk in chunks of this size
+_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# File suffixes accepted for upload, resolved once at import
+_ALLOWED_SUFFIXES = frozenset(suffix.lower() for suffix in settings.ALLOWED_FILE_TYPES)
+
+# Load the MIME type database now so the first upload doesn't pay for it
+mimetypes.init()
+
+# Process pool for CPU-bound text extraction (created on first upload)
+_extraction_pool: Optional[ProcessPoolExecutor] = None
+
+def _get_extraction_pool() -> ProcessPoolExecutor:
+    """Get the shared text extraction process pool, creating it on first use."""
+    global _extraction_pool
+    if _extraction_pool is None:
+        _extraction_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _extraction_pool
+
+def shutdown_extraction_pool() -> None:
+    """Shut down the text extraction process pool if it was started."""
+    global _extraction_pool
+    if _extraction_pool is not None:
+        _extraction_pool.shutdown(cancel_futures=True)
+        _extraction_pool = None
 
 class DocumentUploadResponse(BaseModel):
-    """Response model for document upload."""
+    """Response model for document upload (always built via model_construct)."""
+    model_config = ConfigDict(defer_build=True, revalidate_instances="never")
+
     id: str
     filename: str
     content_type: str
@@ -40,18 +81,59 @@ class DocumentUploadResponse(BaseModel):
     status: str
     message: str
 
-class DocumentInfo(BaseModel):
-    """Model for document information."""
-    id: str
-    filename: str
-    content_type: str
-    size: int
-    text_length: int
-    status: str
-    upload_time: str
+@lru_cache(maxsize=64)
+def _guess_type(filename_suffix: str) -> Optional[str]:
+    """Guess the MIME type for a lowercase file suffix such as ".pdf"."""
+    return mimetypes.guess_type("x" + filename_suffix)[0]
+
+def _spool_upload(source: BinaryIO, max_size: int) -> Tuple[str, int, bytes]:
+    """
+    Copy an upload stream to a temporary file, enforcing the size limit.
+    
+    The stream is copied chunk by chunk, so at most one chunk is held in
+    memory and oversized uploads are rejected as soon as they cross the limit.
+    The content digest used by the extraction cache is computed along the way.
+    
+    Args:
+        source: Binary stream of the uploaded file
+        max_size: Maximum allowed size in bytes
+        
+    Returns:
+        Tuple of (temporary file path, file size in bytes, content digest)
+        
+    Raises:
+        HTTPException: If the upload exceeds max_size
+    """
+    size = 0
+    hasher = hashlib.blake2b(digest_size=16)
+    tmp = tempfile.NamedTemporaryFile(dir=settings.UPLOAD_DIR, delete=False)
+    try:
+        with tmp:
+            while chunk := source.read(_UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_size:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"File exceeds maximum upload size of {max_size:,} bytes"
+                    )
+                hasher.update(chunk)
+                tmp.write(chunk)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
+    return tmp.name, size, hasher.digest()
+
+async def _sync_knowledge_bases() -> None:
+    """Update the document counts and stats of knowledge bases whose documents changed."""
+    # Imported here because the knowledge base router imports documents_db from this module
+    from .knowledge_base import sync_document_counts
+    await sync_document_counts()
 
 @router.post("/upload", response_model=DocumentUploadResponse)
-async def upload_document(file: UploadFile = File(...)) -> DocumentUploadResponse:
+async def upload_document(
+    file: UploadFile = File(...),
+    kb_id: Optional[str] = Form(None)
+) -> DocumentUploadResponse:
     """
     Upload and process a document through LightRAG using official patterns.
     
@@ -62,9 +144,14 @@ async def upload_document(file: UploadFile = File(...)) -> DocumentUploadRespons
     
     Args:
         file: Uploaded file (PDF, DOCX, TXT, etc.)
+        kb_id: Knowledge base the document belongs to (optional)
         
     Returns:
         DocumentUploadResponse with processing results
+        
+    Raises:
+        HTTPException: 400/413/415 for invalid uploads, checked before LightRAG
+            is looked up; 503 if LightRAG is unavailable
     """
     if not file.filename:
         raise HTTPException(
@@ -72,32 +159,57 @@ async def upload_document(file: UploadFile = File(...)) -> DocumentUploadRespons
             detail="No filename provided"
         )
     
+    # FastAPI has already spooled the request body by now; rejecting unsupported
+    # types here only saves the copy to disk and the extraction
+    suffix = Path(file.filename).suffix.lower()
+    if suffix not in _ALLOWED_SUFFIXES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported file type '{suffix}'. Allowed types: {sorted(_ALLOWED_SUFFIXES)}"
+        )
+    
     # Generate unique document ID
     document_id = str(uuid.uuid4())
+    temp_path = None
     
     try:
-        logger.info(f"📤 Processing upload: {file.filename} (ID: {document_id})")
-        
-        # Step 1: Read and validate file
-        logger.info(f"📄 Reading file content...")
-        
-        file_content = await file.read()
-        if not file_content:
+        # Step 1: Stream file to disk and validate size
+        temp_path, file_size, digest = await asyncio.to_thread(
+            _spool_upload, file.file, settings.MAX_UPLOAD_SIZE
+        )
+        if not file_size:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Empty file uploaded"
             )
         
-        content_type = file.content_type or mimetypes.guess_type(file.filename)[0] or "application/octet-stream"
-        file_size = len(file_content)
+        content_type = (
+            file.content_type
+            or _guess_type(suffix)
+            or "application/octet-stream"
+        )
         
-        logger.info(f"   • File size: {file_size:,} bytes")
-        logger.info(f"   • Content type: {content_type}")
+        logger.info(
+            "📤 Processing upload: {} (ID: {}, size: {} bytes, content type: {})",
+            file.filename, document_id, file_size, content_type
+        )
         
         # Step 2: Extract text content
-        logger.info(f"🔤 Extracting text content...")
+        logger.info("🔤 Extracting text content...")
         
-        text_content = extract_text_from_file(file_content, file.filename)
+        # Identical content was already extracted; skip the worker pool
+        text_content = extraction_cache.get(digest, suffix)
+        if text_content is not None:
+            logger.info("   • Text extraction served from cache")
+        else:
+            # PDF/DOCX parsing is CPU-bound; run it in a worker process so it
+            # neither blocks the event loop nor contends for the GIL. Only the
+            # temp file path crosses the process boundary, not the file bytes.
+            loop = asyncio.get_running_loop()
+            text_content = await loop.run_in_executor(
+                _get_extraction_pool(), extract_text_from_path, temp_path, file.filename
+            )
+            extraction_cache.put(digest, suffix, text_content)
         if not text_content or not text_content.strip():
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -108,47 +220,51 @@ async def upload_document(file: UploadFile = File(...)) -> DocumentUploadRespons
         cleaned_text = text_content.strip()
         text_length = len(cleaned_text)
         
-        logger.info(f"   • Extracted text length: {text_length:,} characters")
+        logger.info("   • Extracted text length: {} characters", text_length)
+        
+        # Validation is done, so only now wait for (or fail on) LightRAG
+        rag = await get_rag()
         
         # Step 3: Store document metadata
-        from datetime import datetime
-        
-        document_info = {
-            "id": document_id,
-            "filename": file.filename,
-            "content_type": content_type,
-            "size": file_size,
-            "text_length": text_length,
-            "status": "processing",
-            "upload_time": datetime.utcnow().isoformat(),
-            "text_content": cleaned_text
-        }
+        # Built once from trusted, already-typed values; list/get endpoints
+        # return this instance directly without re-validation
+        document_info = DocumentInfo.model_construct(
+            id=document_id,
+            filename=file.filename,
+            content_type=content_type,
+            size=file_size,
+            text_length=text_length,
+            status="processing",
+            upload_time=time.time(),
+            kb_id=kb_id
+        )
         
-        documents_db[document_id] = document_info
+        documents_db.put(document_info, cleaned_text)
         
         # Step 4: Process through LightRAG using official pattern
-        logger.info(f"🚀 Processing through LightRAG...")
+        logger.info("🚀 Processing through LightRAG...")
         
-        success = await insert_document(cleaned_text, document_id)
+        success = await insert_document(rag, cleaned_text, document_id)
         
         if success:
-            document_info["status"] = "completed"
+            documents_db.set_status(document_id, "completed")
             message = "Document successfully processed and added to knowledge base"
-            logger.info(f"✅ Document {document_id} processed successfully!")
+            logger.info("✅ Document {} processed successfully!", document_id)
         else:
-            document_info["status"] = "failed"
+            documents_db.set_status(document_id, "failed")
             message = "Document processing failed - please try again"
-            logger.error(f"❌ Document {document_id} processing failed")
+            logger.error("❌ Document {} processing failed", document_id)
         
-        documents_db[document_id] = document_info
+        # Storing the document may also have evicted completed documents of other KBs
+        await _sync_knowledge_bases()
         
-        return DocumentUploadResponse(
+        return DocumentUploadResponse.model_construct(
             id=document_id,
             filename=file.filename,
             content_type=content_type,
             size=file_size,
             text_length=text_length,
-            status=document_info["status"],
+            status=document_info.status,
             message=message
         )
         
@@ -156,19 +272,21 @@ async def upload_document(file: UploadFile = File(...)) -> DocumentUploadRespons
         # Re-raise HTTP exceptions as-is
         raise
     except Exception as e:
-        logger.error(f"❌ Unexpected error processing {file.filename}: {e}")
+        logger.error("❌ Unexpected error processing {}: {}", file.filename, e)
         logger.exception("Full upload error traceback:")
         
         # Update document status if it was created
-        if document_id in documents_db:
-            documents_db[document_id]["status"] = "error"
+        documents_db.set_status(document_id, "error")
         
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing document: {str(e)}"
         )
+    finally:
+        if temp_path:
+            os.unlink(temp_path)
 
-@router.get("/", response_model=List[DocumentInfo])
+@router.get("/", response_model=List[DocumentInfo], response_class=MsgspecJSONResponse)
 async def list_documents() -> List[DocumentInfo]:
     """
     Get a list of all uploaded documents with their status.
@@ -177,18 +295,13 @@ async def list_documents() -> List[DocumentInfo]:
         List of document information including processing status
     """
     try:
-        logger.info(f"📋 Listing {len(documents_db)} documents")
+        logger.info("📋 Listing {} documents", len(documents_db))
         
-        documents = []
-        for doc_data in documents_db.values():
-            # Don't include text content in the list response
-            doc_info = {k: v for k, v in doc_data.items() if k != "text_content"}
-            documents.append(DocumentInfo(**doc_info))
-        
-        return documents
+        # Cached list of prebuilt DocumentInfo models without text content
+        return documents_db.snapshot()
         
     except Exception as e:
-        logger.error(f"❌ Error listing documents: {e}")
+        logger.error("❌ Error listing documents: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error retrieving document list"
@@ -212,16 +325,12 @@ async def get_document(document_id: str) -> DocumentInfo:
                 detail="Document not found"
             )
         
-        doc_data = documents_db[document_id]
-        # Don't include text content in the response
-        doc_info = {k: v for k, v in doc_data.items() if k != "text_content"}
-        
-        return DocumentInfo(**doc_info)
+        return documents_db.get(document_id)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error retrieving document {document_id}: {e}")
+        logger.error("❌ Error retrieving document {}: {}", document_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error retrieving document information"
@@ -245,20 +354,20 @@ async def get_document_status(document_id: str) -> Dict[str, Any]:
                 detail="Document not found"
             )
         
-        doc_data = documents_db[document_id]
+        doc_data = documents_db.get(document_id)
         
         return {
             "document_id": document_id,
-            "filename": doc_data["filename"],
-            "status": doc_data["status"],
-            "upload_time": doc_data["upload_time"],
-            "text_length": doc_data["text_length"]
+            "filename": doc_data.filename,
+            "status": doc_data.status,
+            "upload_time": isoformat_utc(doc_data.upload_time),
+            "text_length": doc_data.text_length
         }
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error getting status for document {document_id}: {e}")
+        logger.error("❌ Error getting status for document {}: {}", document_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error retrieving document status"
@@ -282,10 +391,11 @@ async def delete_document(document_id: str) -> Dict[str, str]:
                 detail="Document not found"
             )
         
-        filename = documents_db[document_id]["filename"]
-        del documents_db[document_id]
+        deleted = documents_db.delete(document_id)
+        filename = deleted.filename
+        await _sync_knowledge_bases()
         
-        logger.info(f"🗑️ Deleted document: {filename} (ID: {document_id})")
+        logger.info("🗑️ Deleted document: {} (ID: {})", filename, document_id)
         
         return {
             "message": f"Document {filename} deleted successfully",
@@ -295,7 +405,7 @@ async def delete_document(document_id: str) -> Dict[str, str]:
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error deleting document {document_id}: {e}")
+        logger.error("❌ Error deleting document {}: {}", document_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error deleting document"
@@ -8,32 +8,31 @@ This module handles knowledge base management including:
 - Graph visualization endpoints
 """
 
+import time
 import uuid
+from functools import lru_cache
 from typing import List, Dict, Optional, Any
-from datetime import datetime
+from datetime import datetime, timezone
 
+import orjson
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, ConfigDict, Field
 from loguru import logger
 
 from app.config.settings import settings
-from app.services.lightrag_service import lightrag_service, LightRAGService
+from app.dependencies import get_rag
+from app.models.documents import DocumentInfo
+from app.models.knowledge_base import KnowledgeBaseInfo
+from app.routers.documents import documents_db
+from app.services.kb_repo import KBRepo
+from app.services.kb_stats_cache import kb_stats_cache
+from app.services.knowledge_base_store import KnowledgeBaseStore
+from app.services.lightrag_service import insert_documents, LightRAGService
+from app.utils.responses import ModelORJSONResponse
 
 
 # Pydantic models for request/response validation
-class KnowledgeBaseInfo(BaseModel):
-    """Knowledge base information model."""
-    id: str
-    name: str
-    description: Optional[str] = None
-    created_date: str
-    last_updated: str
-    document_count: int = 0
-    entity_count: int = 0
-    relationship_count: int = 0
-    status: str  # active, inactive, processing
-
-
 class KnowledgeBaseCreateRequest(BaseModel):
     """Request model for creating a knowledge base."""
     name: str
@@ -46,6 +45,17 @@ class KnowledgeBaseUpdateRequest(BaseModel):
     description: Optional[str] = None
 
 
+class ImportedDocument(BaseModel):
+    """A text document in a knowledge base import."""
+    content: str = Field(..., min_length=1)
+    filename: Optional[str] = None
+
+
+class KnowledgeBaseImportRequest(BaseModel):
+    """Request model for importing documents into a knowledge base."""
+    documents: List[ImportedDocument] = Field(..., min_length=1)
+
+
 class KnowledgeBaseListResponse(BaseModel):
     """Response model for knowledge base listing."""
     knowledge_bases: List[KnowledgeBaseInfo]
@@ -54,6 +64,8 @@ class KnowledgeBaseListResponse(BaseModel):
 
 class KnowledgeBaseStats(BaseModel):
     """Knowledge base statistics model."""
+    model_config = ConfigDict(defer_build=True, revalidate_instances="never")
+
     id: str
     name: str
     total_documents: int
@@ -68,20 +80,71 @@ class KnowledgeBaseStats(BaseModel):
 
 class GraphVisualizationData(BaseModel):
     """Graph visualization data model."""
+    model_config = ConfigDict(defer_build=True, revalidate_instances="never")
+
     nodes: List[Dict]
     edges: List[Dict]
     metadata: Dict
 
 
-# Create router instance
-router = APIRouter()
+# Placeholder graph returned until real graph retrieval is implemented
+_PLACEHOLDER_VISUALIZATION = {
+    "nodes": [
+        {"id": "1", "label": "Sample Entity 1", "type": "Person", "size": 10},
+        {"id": "2", "label": "Sample Entity 2", "type": "Organization", "size": 15}
+    ],
+    "edges": [
+        {"from": "1", "to": "2", "label": "works_for", "weight": 1.0}
+    ],
+    "metadata": {
+        "total_nodes": 2,
+        "total_edges": 1,
+        "layout": "force-directed",
+        "filters_applied": {}
+    }
+}
+
+
+@lru_cache(maxsize=64)
+def _placeholder_visualization(entity_type: Optional[str]) -> bytes:
+    """Serialize the placeholder graph once per entity type filter."""
+    if not entity_type:
+        return orjson.dumps(_PLACEHOLDER_VISUALIZATION)
+    metadata = {**_PLACEHOLDER_VISUALIZATION["metadata"], "filters_applied": {"entity_type": entity_type}}
+    return orjson.dumps({**_PLACEHOLDER_VISUALIZATION, "metadata": metadata})
+
+
+# Create router instance; handlers return ModelORJSONResponse directly, so the
+# response models below only document the API and are not re-validated
+router = APIRouter(default_response_class=ORJSONResponse)
 
 # In-memory storage for knowledge base information (replace with database in production)
-knowledge_bases_db: Dict[str, KnowledgeBaseInfo] = {}
+knowledge_bases_db = KnowledgeBaseStore()
+# Optional Redis persistence; handlers sync the store through it before reads and after writes
+kb_repo = KBRepo(knowledge_bases_db, ttl=settings.KB_CACHE_TTL)
+
+
+async def _require_knowledge_base(kb_id: str, reload: bool = False) -> None:
+    """
+    Sync the store with the repository and ensure a knowledge base exists.
+    
+    Args:
+        kb_id: Knowledge base ID
+        reload: Re-read this record from the repository (before updating it)
+        
+    Raises:
+        HTTPException: If knowledge base is not found
+    """
+    if reload:
+        await kb_repo.reload(kb_id)
+    else:
+        await kb_repo.refresh()
+    if kb_id not in knowledge_bases_db:
+        raise HTTPException(status_code=404, detail="Knowledge base not found")
 
 
 @router.post("/", response_model=KnowledgeBaseInfo)
-async def create_knowledge_base(request: KnowledgeBaseCreateRequest) -> KnowledgeBaseInfo:
+async def create_knowledge_base(request: KnowledgeBaseCreateRequest) -> ModelORJSONResponse:
     """
     Create a new knowledge base.
     
@@ -98,34 +161,21 @@ async def create_knowledge_base(request: KnowledgeBaseCreateRequest) -> Knowledg
         # Generate unique knowledge base ID
         kb_id = str(uuid.uuid4())
         
-        # Create knowledge base info
-        now = datetime.now().isoformat()
-        kb_info = KnowledgeBaseInfo(
-            id=kb_id,
-            name=request.name,
-            description=request.description,
-            created_date=now,
-            last_updated=now,
-            document_count=0,
-            entity_count=0,
-            relationship_count=0,
-            status="active"
-        )
-        
-        # Store in database
-        knowledge_bases_db[kb_id] = kb_info
+        # Create and store knowledge base info
+        kb_info = knowledge_bases_db.create(kb_id, request.name, request.description)
+        await kb_repo.save(kb_id)
         
-        logger.info(f"Knowledge base created: {kb_id} ({request.name})")
+        logger.info("Knowledge base created: {} ({})", kb_id, request.name)
         
-        return kb_info
+        return ModelORJSONResponse(kb_info)
         
     except Exception as e:
-        logger.error(f"Error creating knowledge base: {e}")
+        logger.error("Error creating knowledge base: {}", e)
         raise HTTPException(status_code=500, detail="Failed to create knowledge base")
 
 
 @router.get("/", response_model=KnowledgeBaseListResponse)
-async def list_knowledge_bases() -> KnowledgeBaseListResponse:
+async def list_knowledge_bases() -> Response:
     """
     List all knowledge bases.
     
@@ -133,23 +183,23 @@ async def list_knowledge_bases() -> KnowledgeBaseListResponse:
         KnowledgeBaseListResponse containing all knowledge bases
     """
     try:
-        knowledge_bases = list(knowledge_bases_db.values())
+        await kb_repo.refresh()
         
-        # Sort by creation date (newest first)
-        knowledge_bases.sort(key=lambda x: x.created_date, reverse=True)
-        
-        return KnowledgeBaseListResponse(
-            knowledge_bases=knowledge_bases,
-            total_count=len(knowledge_bases)
+        # Joined from per-KB cached JSON, already in creation order (newest first)
+        body = b'{"knowledge_bases":%b,"total_count":%d}' % (
+            knowledge_bases_db.list_json_newest_first(),
+            len(knowledge_bases_db)
         )
         
+        return Response(content=body, media_type="application/json")
+        
     except Exception as e:
-        logger.error(f"Error listing knowledge bases: {e}")
+        logger.error("Error listing knowledge bases: {}", e)
         raise HTTPException(status_code=500, detail="Failed to list knowledge bases")
 
 
 @router.get("/{kb_id}", response_model=KnowledgeBaseInfo)
-async def get_knowledge_base(kb_id: str) -> KnowledgeBaseInfo:
+async def get_knowledge_base(kb_id: str) -> Response:
     """
     Get information about a specific knowledge base.
     
@@ -162,21 +212,13 @@ async def get_knowledge_base(kb_id: str) -> KnowledgeBaseInfo:
     Raises:
         HTTPException: If knowledge base is not found
     """
-    try:
-        if kb_id not in knowledge_bases_db:
-            raise HTTPException(status_code=404, detail="Knowledge base not found")
-        
-        return knowledge_bases_db[kb_id]
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting knowledge base {kb_id}: {e}")
-        raise HTTPException(status_code=500, detail="Failed to get knowledge base")
+    await _require_knowledge_base(kb_id)
+    
+    return Response(content=knowledge_bases_db.get_json(kb_id), media_type="application/json")
 
 
 @router.put("/{kb_id}", response_model=KnowledgeBaseInfo)
-async def update_knowledge_base(kb_id: str, request: KnowledgeBaseUpdateRequest) -> KnowledgeBaseInfo:
+async def update_knowledge_base(kb_id: str, request: KnowledgeBaseUpdateRequest) -> Response:
     """
     Update a knowledge base.
     
@@ -190,29 +232,32 @@ async def update_knowledge_base(kb_id: str, request: KnowledgeBaseUpdateRequest)
     Raises:
         HTTPException: If knowledge base is not found or update fails
     """
+    await _require_knowledge_base(kb_id, reload=True)
+    
     try:
-        if kb_id not in knowledge_bases_db:
-            raise HTTPException(status_code=404, detail="Knowledge base not found")
+        # Update fields that are provided and differ from the stored values
+        changes = {}
+        if request.name is not None and request.name != knowledge_bases_db.get_field(kb_id, "name"):
+            changes["name"] = request.name
+        if request.description is not None and request.description != knowledge_bases_db.get_field(kb_id, "description"):
+            changes["description"] = request.description
         
-        kb_info = knowledge_bases_db[kb_id]
-        
-        # Update fields if provided
-        if request.name is not None:
-            kb_info.name = request.name
-        if request.description is not None:
-            kb_info.description = request.description
+        # Nothing changed: keep last_updated and the caches as they are
+        if not changes:
+            return Response(content=knowledge_bases_db.get_json(kb_id), media_type="application/json")
         
         # Update timestamp
-        kb_info.last_updated = datetime.now().isoformat()
+        changes["updated_ts"] = time.time()
+        knowledge_bases_db.update(kb_id, **changes)
+        await kb_repo.save(kb_id)
+        kb_stats_cache.invalidate(kb_id)
         
-        logger.info(f"Knowledge base updated: {kb_id}")
+        logger.info("Knowledge base updated: {}", kb_id)
         
-        return kb_info
+        return ModelORJSONResponse(knowledge_bases_db.get(kb_id))
         
-    except HTTPException:
-        raise
     except Exception as e:
-        logger.error(f"Error updating knowledge base {kb_id}: {e}")
+        logger.error("Error updating knowledge base {}: {}", kb_id, e)
         raise HTTPException(status_code=500, detail="Failed to update knowledge base")
 
 
@@ -230,10 +275,9 @@ async def delete_knowledge_base(kb_id: str) -> Dict[str, str]:
     Raises:
         HTTPException: If knowledge base is not found or deletion fails
     """
+    await _require_knowledge_base(kb_id)
+    
     try:
-        if kb_id not in knowledge_bases_db:
-            raise HTTPException(status_code=404, detail="Knowledge base not found")
-        
         # TODO: Implement cleanup of associated data
         # - Remove all documents from this knowledge base
         # - Remove from vector database
@@ -241,116 +285,116 @@ async def delete_knowledge_base(kb_id: str) -> Dict[str, str]:
         # - Clean up any background processing tasks
         
         # Remove from knowledge bases database
-        del knowledge_bases_db[kb_id]
+        knowledge_bases_db.delete(kb_id)
+        await kb_repo.remove(kb_id)
+        kb_stats_cache.invalidate(kb_id)
         
-        logger.info(f"Knowledge base deleted: {kb_id}")
+        logger.info("Knowledge base deleted: {}", kb_id)
         
         return {"message": f"Knowledge base {kb_id} deleted successfully"}
         
-    except HTTPException:
-        raise
     except Exception as e:
-        logger.error(f"Error deleting knowledge base {kb_id}: {e}")
+        logger.error("Error deleting knowledge base {}: {}", kb_id, e)
         raise HTTPException(status_code=500, detail="Failed to delete knowledge base")
 
 
+async def sync_document_counts() -> None:
+    """
+    Write current document counts into the records of changed knowledge bases.
+    
+    Called on the write paths (upload, document deletion, import) after the
+    document store's aggregates change, so stats reads stay read-only. Also
+    drops the changed knowledge bases' cached stats.
+    """
+    for kb_id in documents_db.pop_changed_kbs():
+        if kb_id is None:
+            continue
+        kb_stats_cache.invalidate(kb_id)
+        await kb_repo.reload(kb_id)
+        if kb_id not in knowledge_bases_db:
+            continue
+        total_documents = documents_db.aggregate(kb_id).doc_count
+        if knowledge_bases_db.get_field(kb_id, "document_count") != total_documents:
+            knowledge_bases_db.update(
+                kb_id,
+                document_count=total_documents,
+                updated_ts=time.time()
+            )
+            await kb_repo.save(kb_id)
+
+
+async def _build_stats(kb_id: str, kb_info: KnowledgeBaseInfo) -> KnowledgeBaseStats:
+    """
+    Compute statistics for a knowledge base from the document store's aggregates.
+    
+    Args:
+        kb_id: Knowledge base ID
+        kb_info: Stored knowledge base information
+        
+    Returns:
+        KnowledgeBaseStats for the knowledge base
+    """
+    # Running totals maintained as documents complete, so this is a single lookup
+    aggregate = documents_db.aggregate(kb_id)
+    total_documents = aggregate.doc_count
+    total_size_mb = aggregate.bytes_total / (1024 * 1024)  # Convert bytes to MB
+    
+    stats = KnowledgeBaseStats.model_construct(
+        id=kb_id,
+        name=kb_info.name,
+        total_documents=total_documents,
+        total_entities=0,  # LightRAG doesn't expose entity count directly
+        total_relationships=0,  # LightRAG doesn't expose relationship count directly
+        total_size_mb=round(total_size_mb, 2),
+        last_query_date=None,  # Could be tracked separately
+        query_count=0,  # Could be tracked separately
+        most_common_entities=[
+            # Note: LightRAG doesn't provide entity frequency data directly
+            # This would require custom analysis of the knowledge graph
+        ],
+        recent_documents=documents_db.recent_completed(kb_id)  # Last 5 processed documents
+    )
+    
+    logger.info(
+        "📊 Knowledge base stats generated for {} (documents: {}, size: {:.2f}MB)",
+        kb_id, total_documents, total_size_mb
+    )
+    
+    return stats
+
+
 @router.get("/{kb_id}/stats", response_model=KnowledgeBaseStats)
-async def get_knowledge_base_stats(kb_id: str) -> KnowledgeBaseStats:
+async def get_knowledge_base_stats(kb_id: str) -> ModelORJSONResponse:
     """
-    Get detailed statistics for a knowledge base using LightRAG.
+    Get detailed statistics for a knowledge base.
+    
+    Results are cached for `KB_STATS_CACHE_TTL` seconds and invalidated when
+    documents are inserted or the knowledge base is imported into or deleted.
     
     Args:
         kb_id: Knowledge base ID
         
     Returns:
-        KnowledgeBaseStats containing detailed statistics from LightRAG
+        KnowledgeBaseStats containing detailed statistics
         
     Raises:
         HTTPException: If knowledge base is not found
     """
+    await _require_knowledge_base(kb_id)
+    
     try:
-        if kb_id not in knowledge_bases_db:
-            raise HTTPException(status_code=404, detail="Knowledge base not found")
-        
-        kb_info = knowledge_bases_db[kb_id]
-        
-        # Get real statistics from LightRAG
-        try:
-            lightrag_stats = await lightrag_service.get_knowledge_graph_stats()
-            
-            # Calculate storage size from cache files
-            total_size_mb = 0.0
-            cache_size = lightrag_stats.get("cache_size", 0)
-            if cache_size > 0:
-                total_size_mb = cache_size / (1024 * 1024)  # Convert bytes to MB
-            
-            # Get document count from our documents database
-            from .documents import documents_db
-            total_documents = len([doc for doc in documents_db.values() if doc.status == "completed"])
-            
-            # Extract storage backend information
-            storage_backends = lightrag_stats.get("storage_backends", {})
-            
-            stats = KnowledgeBaseStats(
-                id=kb_id,
-                name=kb_info.name,
-                total_documents=total_documents,
-                total_entities=0,  # LightRAG doesn't expose entity count directly
-                total_relationships=0,  # LightRAG doesn't expose relationship count directly
-                total_size_mb=round(total_size_mb, 2),
-                last_query_date=None,  # Could be tracked separately
-                query_count=0,  # Could be tracked separately
-                most_common_entities=[
-                    # Note: LightRAG doesn't provide entity frequency data directly
-                    # This would require custom analysis of the knowledge graph
-                ],
-                recent_documents=[
-                    doc.filename for doc in sorted(
-                        [d for d in documents_db.values() if d.status == "completed"],
-                        key=lambda x: x.upload_date,
-                        reverse=True
-                    )[:5]  # Last 5 processed documents
-                ]
-            )
-            
-            # Update KB info with current document count
-            kb_info.document_count = total_documents
-            kb_info.last_updated = datetime.now().isoformat()
-            
-            logger.info(f"📊 Knowledge base stats generated for {kb_id}")
-            logger.info(f"   Documents: {total_documents}, Size: {total_size_mb:.2f}MB")
-            logger.info(f"   Storage: {storage_backends}")
-            
-            return stats
-            
-        except Exception as e:
-            logger.warning(f"Could not get LightRAG stats: {e}")
-            
-            # Fallback to basic stats if LightRAG is not available
-            stats = KnowledgeBaseStats(
-                id=kb_id,
-                name=kb_info.name,
-                total_documents=kb_info.document_count,
-                total_entities=0,
-                total_relationships=0,
-                total_size_mb=0.0,
-                last_query_date=None,
-                query_count=0,
-                most_common_entities=[],
-                recent_documents=[]
-            )
-            
-            return stats
+        kb_info = knowledge_bases_db.get(kb_id)
+        stats = await kb_stats_cache.get_or_compute(kb_id, lambda: _build_stats(kb_id, kb_info))
+        
+        return ModelORJSONResponse(stats)
         
-    except HTTPException:
-        raise
     except Exception as e:
-        logger.error(f"Error getting stats for knowledge base {kb_id}: {e}")
+        logger.error("Error getting stats for knowledge base {}: {}", kb_id, e)
         raise HTTPException(status_code=500, detail="Failed to get knowledge base statistics")
 
 
 @router.get("/{kb_id}/export")
-async def export_knowledge_base(kb_id: str, format: str = "json") -> Dict:
+async def export_knowledge_base(kb_id: str, format: str = "json") -> Response:
     """
     Export a knowledge base in the specified format.
     
@@ -364,70 +408,104 @@ async def export_knowledge_base(kb_id: str, format: str = "json") -> Dict:
     Raises:
         HTTPException: If knowledge base is not found or export fails
     """
+    await _require_knowledge_base(kb_id)
+    
     try:
-        if kb_id not in knowledge_bases_db:
-            raise HTTPException(status_code=404, detail="Knowledge base not found")
-        
         # TODO: Implement actual export functionality
         # - Query all entities and relationships
         # - Format according to requested format
         # - Include metadata and statistics
+        # - Stream csv/graphml row by row (StreamingResponse) to bound memory
         
-        # For now, return placeholder data
+        # For now, return placeholder data; orjson encodes the datetime natively
         export_data = {
             "knowledge_base_id": kb_id,
             "export_format": format,
-            "export_date": datetime.now().isoformat(),
+            "export_date": datetime.now(timezone.utc),
             "entities": [],
             "relationships": [],
-            "metadata": knowledge_bases_db[kb_id].dict()
+            "metadata": knowledge_bases_db.get(kb_id).model_dump()
         }
         
-        logger.info(f"Knowledge base exported: {kb_id} (format: {format})")
+        logger.info("Knowledge base exported: {} (format: {})", kb_id, format)
         
-        return export_data
+        return Response(
+            content=orjson.dumps(export_data, option=orjson.OPT_NON_STR_KEYS),
+            media_type="application/json"
+        )
         
-    except HTTPException:
-        raise
     except Exception as e:
-        logger.error(f"Error exporting knowledge base {kb_id}: {e}")
+        logger.error("Error exporting knowledge base {}: {}", kb_id, e)
         raise HTTPException(status_code=500, detail="Failed to export knowledge base")
 
 
 @router.post("/{kb_id}/import")
-async def import_knowledge_base(kb_id: str, data: Dict) -> Dict[str, str]:
+async def import_knowledge_base(
+    kb_id: str,
+    data: KnowledgeBaseImportRequest
+) -> Dict[str, Any]:
     """
-    Import data into a knowledge base.
+    Import text documents into a knowledge base.
+    
+    All documents are inserted into LightRAG in a single batch and tracked in
+    the document store under this knowledge base. The batch is all-or-nothing,
+    so either every document is imported or none is.
+    
+    The body must be `{"documents": [{"content": ..., "filename": ...}]}`;
+    the free-form payloads the former placeholder accepted are rejected with 422.
     
     Args:
         kb_id: Knowledge base ID
-        data: Import data in supported format
+        data: Documents to import
         
     Returns:
-        Import status message
+        Import status message with per-status document counts
         
     Raises:
-        HTTPException: If knowledge base is not found or import fails
+        HTTPException: 404 if the knowledge base is not found, 503 if LightRAG
+            is unavailable, 500 if the import fails
     """
+    await _require_knowledge_base(kb_id)
+    # Looked up after the existence check so an unknown kb_id is a 404 even while LightRAG is down
+    rag = await get_rag()
+    
     try:
-        if kb_id not in knowledge_bases_db:
-            raise HTTPException(status_code=404, detail="Knowledge base not found")
+        # TODO: Support entity/relationship imports (e.g. from an export)
+        items = []
+        for doc in data.documents:
+            document_id = str(uuid.uuid4())
+            documents_db.put(
+                DocumentInfo.model_construct(
+                    id=document_id,
+                    filename=doc.filename or f"{document_id}.txt",
+                    content_type="text/plain",
+                    size=len(doc.content.encode("utf-8")),
+                    text_length=len(doc.content),
+                    status="processing",
+                    upload_time=time.time(),
+                    kb_id=kb_id
+                ),
+                doc.content
+            )
+            items.append((doc.content, document_id))
         
-        # TODO: Implement actual import functionality
-        # - Validate import data format
-        # - Parse entities and relationships
-        # - Update vector database
-        # - Update graph database
-        # - Update knowledge base statistics
+        results = await insert_documents(rag, items)
+        for (_, document_id), success in zip(items, results):
+            documents_db.set_status(document_id, "completed" if success else "failed")
+        await sync_document_counts()
         
-        logger.info(f"Data imported to knowledge base: {kb_id}")
+        imported = sum(results)
+        logger.info("Data imported to knowledge base: {} ({}/{} documents)", kb_id, imported, len(items))
         
-        return {"message": f"Data imported successfully to knowledge base {kb_id}"}
+        return {
+            "message": f"Data imported successfully to knowledge base {kb_id}" if imported
+            else f"Import into knowledge base {kb_id} failed",
+            "imported": imported,
+            "failed": len(items) - imported
+        }
         
-    except HTTPException:
-        raise
     except Exception as e:
-        logger.error(f"Error importing to knowledge base {kb_id}: {e}")
+        logger.error("Error importing to knowledge base {}: {}", kb_id, e)
         raise HTTPException(status_code=500, detail="Failed to import data")
 
 
@@ -436,7 +514,7 @@ async def get_graph_visualization(
     kb_id: str,
     max_nodes: int = 100,
     entity_type: Optional[str] = None
-) -> GraphVisualizationData:
+) -> Response:
     """
     Get graph visualization data for a knowledge base.
     
@@ -451,42 +529,23 @@ async def get_graph_visualization(
     Raises:
         HTTPException: If knowledge base is not found or visualization fails
     """
+    if not settings.ENABLE_GRAPH_VISUALIZATION:
+        raise HTTPException(status_code=404, detail="Graph visualization is disabled")
+    
+    await _require_knowledge_base(kb_id)
+    
     try:
-        if kb_id not in knowledge_bases_db:
-            raise HTTPException(status_code=404, detail="Knowledge base not found")
-        
-        if not settings.ENABLE_GRAPH_VISUALIZATION:
-            raise HTTPException(status_code=404, detail="Graph visualization is disabled")
-        
         # TODO: Implement actual graph data retrieval
         # - Query graph database for entities and relationships
         # - Apply filters (entity_type, max_nodes)
         # - Format for visualization library (e.g., D3.js, vis.js)
         # - Include node positions and styling information
         
-        # For now, return placeholder data
-        visualization_data = GraphVisualizationData(
-            nodes=[
-                {"id": "1", "label": "Sample Entity 1", "type": "Person", "size": 10},
-                {"id": "2", "label": "Sample Entity 2", "type": "Organization", "size": 15}
-            ],
-            edges=[
-                {"from": "1", "to": "2", "label": "works_for", "weight": 1.0}
-            ],
-            metadata={
-                "total_nodes": 2,
-                "total_edges": 1,
-                "layout": "force-directed",
-                "filters_applied": {"entity_type": entity_type} if entity_type else {}
-            }
-        )
-        
-        logger.info(f"Graph visualization data generated for KB: {kb_id}")
+        # For now, return the pre-serialized placeholder data
+        logger.info("Graph visualization data generated for KB: {}", kb_id)
         
-        return visualization_data
+        return Response(content=_placeholder_visualization(entity_type), media_type="application/json")
         
-    except HTTPException:
-        raise
     except Exception as e:
-        logger.error(f"Error generating visualization for {kb_id}: {e}")
-        raise HTTPException(status_code=500, detail="Failed to generate graph visualization") 
\ No newline at end of file
+        logger.error("Error generating visualization for {}: {}", kb_id, e)
+        raise HTTPException(status_code=500, detail="Failed to generate graph visualization")
@@ -0,0 +1,245 @@
+"""
+Document Store
+
+In-memory storage for uploaded document metadata and extracted text.
+
+Metadata and text are kept in separate mappings keyed by document ID, so
+listing documents walks only the small metadata records and never touches
+the (potentially large) extracted text. Metadata is stored as prebuilt
+`DocumentInfo` models so API handlers can return them without conversion.
+
+The store is bounded: once `max_documents` records are held, storing a new
+document evicts the least recently stored one. `snapshot()` returns a cached
+list of all records that is rebuilt only after a put or delete.
+
+Per-knowledge-base views of completed documents (an index of document IDs,
+the most recent documents and running totals in `KBAggregate`) are maintained
+as documents change status, so stats reads do not scan or sort the store.
+"""
+
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import AbstractSet, Deque, Dict, Iterator, List, Optional, Set
+
+from app.models.documents import DocumentInfo
+
+# Number of most recently completed documents tracked per knowledge base
+RECENT_DOCUMENTS_LIMIT = 5
+
+
+@dataclass(slots=True)
+class KBAggregate:
+    """Running totals over a knowledge base's completed documents."""
+    doc_count: int = 0
+    bytes_total: int = 0  # UTF-8 size of the extracted text
+    last_ts: float = 0.0  # epoch seconds of the most recent completion
+
+
+class DocumentStore:
+    """
+    Document store holding metadata and text content in parallel mappings.
+
+    `meta` maps document ID to its `DocumentInfo` record and `text_blobs` maps the
+    same ID to the extracted text. `meta` is ordered oldest first, which is the
+    eviction order. Replace with a database in production.
+    """
+
+    def __init__(self, max_documents: int = 10_000):
+        """
+        Initialize an empty document store.
+
+        Args:
+            max_documents: Maximum number of documents to keep before evicting the oldest
+        """
+        self.max_documents = max_documents
+        self.meta: "OrderedDict[str, DocumentInfo]" = OrderedDict()
+        self.text_blobs: Dict[str, str] = {}
+        self._snapshot: Optional[List[DocumentInfo]] = None
+        # Views of completed documents keyed by kb_id (None for unassigned documents)
+        self._completed_by_kb: Dict[Optional[str], Set[str]] = {}
+        self._recent_completed: Dict[Optional[str], Deque[str]] = {}
+        self._aggregates: Dict[Optional[str], KBAggregate] = {}
+        self._text_sizes: Dict[str, int] = {}
+        # Knowledge bases whose completed documents changed since `pop_changed_kbs`
+        self._changed_kbs: Set[Optional[str]] = set()
+
+    def __contains__(self, document_id: str) -> bool:
+        return document_id in self.meta
+
+    def __len__(self) -> int:
+        return len(self.meta)
+
+    def values(self) -> Iterator[DocumentInfo]:
+        """Iterate over all document metadata records."""
+        return iter(self.meta.values())
+
+    def snapshot(self) -> List[DocumentInfo]:
+        """
+        Get all document metadata records as a list.
+
+        The list is cached until the next put or delete; status updates modify
+        the records in place and do not invalidate it. Callers must not mutate
+        the returned list.
+
+        Returns:
+            List of metadata records, oldest first
+        """
+        if self._snapshot is None:
+            self._snapshot = list(self.meta.values())
+        return self._snapshot
+
+    def completed_ids(self, kb_id: Optional[str]) -> AbstractSet[str]:
+        """Get the IDs of completed documents in a knowledge base (do not mutate)."""
+        return self._completed_by_kb.get(kb_id, frozenset())
+
+    def completed_count(self, kb_id: Optional[str]) -> int:
+        """Get the number of completed documents in a knowledge base."""
+        return len(self.completed_ids(kb_id))
+
+    def aggregate(self, kb_id: Optional[str]) -> KBAggregate:
+        """Get the running totals for a knowledge base (do not mutate)."""
+        return self._aggregates.get(kb_id) or KBAggregate()
+
+    def recent_completed(self, kb_id: Optional[str]) -> List[str]:
+        """
+        Get filenames of the most recently completed documents in a knowledge base.
+
+        Args:
+            kb_id: Knowledge base ID
+
+        Returns:
+            Up to `RECENT_DOCUMENTS_LIMIT` filenames, newest first
+        """
+        return [self.meta[document_id].filename for document_id in self._recent_completed.get(kb_id, ())]
+
+    def pop_changed_kbs(self) -> Set[Optional[str]]:
+        """
+        Take the knowledge bases whose completed documents changed since the last call.
+
+        Includes knowledge bases that lost documents to eviction.
+
+        Returns:
+            Knowledge base IDs (None for unassigned documents)
+        """
+        changed, self._changed_kbs = self._changed_kbs, set()
+        return changed
+
+    def add_completed(self, kb_id: Optional[str], document_id: str) -> None:
+        """
+        Record a document as completed in its knowledge base views.
+
+        Args:
+            kb_id: Knowledge base ID
+            document_id: Unique document identifier
+        """
+        completed = self._completed_by_kb.setdefault(kb_id, set())
+        if document_id in completed:
+            return
+        completed.add(document_id)
+        self._changed_kbs.add(kb_id)
+        aggregate = self._aggregates.get(kb_id)
+        if aggregate is None:
+            aggregate = self._aggregates[kb_id] = KBAggregate()
+        aggregate.doc_count += 1
+        aggregate.bytes_total += self._text_sizes.get(document_id, 0)
+        aggregate.last_ts = time.time()
+        recent = self._recent_completed.get(kb_id)
+        if recent is None:
+            recent = self._recent_completed[kb_id] = deque(maxlen=RECENT_DOCUMENTS_LIMIT)
+        recent.appendleft(document_id)
+
+    def remove_completed(self, kb_id: Optional[str], document_id: str) -> None:
+        """
+        Remove a document from its knowledge base's completed views.
+
+        Args:
+            kb_id: Knowledge base ID
+            document_id: Unique document identifier
+        """
+        completed = self._completed_by_kb.get(kb_id)
+        if completed is None or document_id not in completed:
+            return
+        completed.discard(document_id)
+        self._changed_kbs.add(kb_id)
+        aggregate = self._aggregates[kb_id]
+        aggregate.doc_count -= 1
+        aggregate.bytes_total -= self._text_sizes.get(document_id, 0)
+        if not completed:
+            del self._completed_by_kb[kb_id]
+            del self._aggregates[kb_id]
+        recent = self._recent_completed.get(kb_id)
+        if recent is not None and document_id in recent:
+            # The list is not backfilled; older documents reappear only as new ones complete
+            recent.remove(document_id)
+
+    def put(self, meta: DocumentInfo, text_content: str) -> None:
+        """
+        Store a document's metadata and extracted text.
+
+        Evicts the oldest documents if the store is over `max_documents`.
+
+        Args:
+            meta: Document metadata record
+            text_content: Extracted text content
+        """
+        previous = self.meta.get(meta.id)
+        if previous is not None and previous.status == "completed":
+            self.remove_completed(previous.kb_id, previous.id)
+        self.meta[meta.id] = meta
+        self.meta.move_to_end(meta.id)
+        self.text_blobs[meta.id] = text_content
+        self._text_sizes[meta.id] = len(text_content.encode("utf-8"))
+        if meta.status == "completed":
+            self.add_completed(meta.kb_id, meta.id)
+        while len(self.meta) > self.max_documents:
+            evicted_id, evicted = self.meta.popitem(last=False)
+            if evicted.status == "completed":
+                self.remove_completed(evicted.kb_id, evicted.id)
+            self.text_blobs.pop(evicted_id, None)
+            self._text_sizes.pop(evicted_id, None)
+        self._snapshot = None
+
+    def get(self, document_id: str) -> Optional[DocumentInfo]:
+        """Get a document's metadata record, or None if it does not exist."""
+        return self.meta.get(document_id)
+
+    def get_text(self, document_id: str) -> Optional[str]:
+        """Get a document's extracted text, or None if it does not exist."""
+        return self.text_blobs.get(document_id)
+
+    def set_status(self, document_id: str, status: str) -> None:
+        """
+        Update the processing status of a stored document.
+
+        Args:
+            document_id: Unique document identifier
+            status: New processing status
+        """
+        meta = self.meta.get(document_id)
+        if meta is None or meta.status == status:
+            return
+        if meta.status == "completed":
+            self.remove_completed(meta.kb_id, meta.id)
+        meta.status = status
+        if status == "completed":
+            self.add_completed(meta.kb_id, meta.id)
+
+    def delete(self, document_id: str) -> Optional[DocumentInfo]:
+        """
+        Remove a document and its text from the store.
+
+        Args:
+            document_id: Unique document identifier
+
+        Returns:
+            The removed metadata record, or None if it did not exist
+        """
+        meta = self.meta.pop(document_id, None)
+        if meta is not None:
+            if meta.status == "completed":
+                self.remove_completed(meta.kb_id, meta.id)
+            self._snapshot = None
+        self.text_blobs.pop(document_id, None)
+        self._text_sizes.pop(document_id, None)
+        return meta
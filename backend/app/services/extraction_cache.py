@@ -0,0 +1,85 @@
+"""
+Extraction Cache
+
+In-process LRU cache of text extracted from uploads.
+
+Extraction runs in worker processes, so the cache lives in the API process
+and is consulted before a job is submitted to the pool: re-uploading an
+identical file skips the pool entirely. Entries are keyed by a digest of the
+file content and its extension, and the cache is bounded by the total number
+of cached characters (`EXTRACTION_CACHE_MAX_CHARS`) rather than entry count,
+since one extracted book can outweigh hundreds of short notes.
+"""
+
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.config.settings import settings
+
+
+class ExtractionCache:
+    """
+    Least recently used cache of extracted text, bounded by total characters.
+
+    Only accessed from the event loop, so no locking is needed.
+    """
+
+    def __init__(self, max_chars: int):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_chars: Total characters of cached text to keep
+        """
+        self.max_chars = max_chars
+        self._entries: "OrderedDict[Tuple[bytes, str], str]" = OrderedDict()
+        self._chars = 0
+
+    def get(self, digest: bytes, extension: str) -> Optional[str]:
+        """
+        Get the cached text for a file, marking it as recently used.
+
+        Args:
+            digest: Digest of the file content
+            extension: Lower-cased file extension, such as ".pdf"
+
+        Returns:
+            Cached text, or None on a miss
+        """
+        key = (digest, extension)
+        text = self._entries.get(key)
+        if text is not None:
+            self._entries.move_to_end(key)
+        return text
+
+    def put(self, digest: bytes, extension: str, text: str) -> None:
+        """
+        Store extracted text, evicting least recently used entries to stay within max_chars.
+
+        Texts longer than max_chars on their own are not cached.
+
+        Args:
+            digest: Digest of the file content
+            extension: Lower-cased file extension, such as ".pdf"
+            text: Extracted text
+        """
+        if len(text) > self.max_chars:
+            return
+
+        key = (digest, extension)
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._chars -= len(previous)
+
+        self._entries[key] = text
+        self._chars += len(text)
+        while self._chars > self.max_chars:
+            _, evicted = self._entries.popitem(last=False)
+            self._chars -= len(evicted)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Global cache instance
+extraction_cache = ExtractionCache(max_chars=settings.EXTRACTION_CACHE_MAX_CHARS)
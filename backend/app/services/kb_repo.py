@@ -0,0 +1,144 @@
+"""
+Knowledge Base Repository
+
+Optional Redis persistence for knowledge base records.
+
+The in-memory `KnowledgeBaseStore` is process-local, so records are lost on
+restart and each uvicorn worker sees its own set. With
+`ENABLE_REDIS_KB_STORE`, every record is also written to one Redis hash
+(`kb:records`, field = KB ID, value = orjson blob), and the local store acts
+as a read cache. It is refreshed from Redis once it is older than
+`KB_CACHE_TTL` seconds, and the target record is reloaded before every write.
+A refresh only replaces the records whose Redis values changed since they were
+last seen, so unchanged records keep their cached JSON encoding.
+When the option is disabled, every method is a no-op and the store is the only
+copy.
+
+Unlike the query cache, Redis errors here are not swallowed: losing a write
+silently would be worse than failing the request.
+"""
+
+import time
+from typing import Dict, Optional
+
+import orjson
+import redis.asyncio as redis
+from loguru import logger
+
+from app.config.settings import settings
+from app.services.knowledge_base_store import KnowledgeBaseStore
+
+# Redis hash holding all knowledge base records
+KB_RECORDS_KEY = "kb:records"
+
+
+class KBRepo:
+    """
+    Keeps a `KnowledgeBaseStore` in sync with Redis.
+
+    Handlers call `refresh()` or `reload()` before reading or updating and
+    `save()` / `remove()` after writing. Reads are then served from the store.
+    """
+
+    def __init__(self, store: KnowledgeBaseStore, ttl: float):
+        """
+        Initialize the repository without connecting to Redis.
+
+        Args:
+            store: Local store used as the read cache
+            ttl: Seconds before the local store is reloaded from Redis
+        """
+        self.store = store
+        self.ttl = ttl
+        self._client: Optional[redis.Redis] = None
+        self._loaded_at: Optional[float] = None
+        # Redis value of each record as last read or written, keyed by KB ID
+        self._blobs: Dict[str, str] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Whether Redis persistence is enabled in settings."""
+        return settings.ENABLE_REDIS_KB_STORE
+
+    def _get_client(self) -> redis.Redis:
+        """Get the Redis client, creating it on first use."""
+        if self._client is None:
+            config = dict(settings.redis_config)
+            self._client = redis.from_url(config.pop("url"), **config)
+        return self._client
+
+    async def refresh(self) -> None:
+        """
+        Sync the local store with Redis if the local copy has expired.
+
+        Only records whose Redis values differ from the last ones seen are
+        reloaded, and only records that disappeared from Redis are dropped.
+        Records created locally but not saved yet are left alone.
+        """
+        if not self.enabled:
+            return
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return
+        blobs = await self._get_client().hgetall(KB_RECORDS_KEY)
+        changed = 0
+        for kb_id, blob in blobs.items():
+            if self._blobs.get(kb_id) != blob:
+                self.store.put_row(orjson.loads(blob))
+                changed += 1
+        for kb_id in self._blobs.keys() - blobs.keys():
+            self.store.delete(kb_id)
+            changed += 1
+        self._blobs = blobs
+        self._loaded_at = time.monotonic()
+        logger.debug("Refreshed {} of {} knowledge bases from Redis", changed, len(self.store))
+
+    async def reload(self, kb_id: str) -> None:
+        """
+        Reload one record from Redis, ahead of updating it.
+
+        Args:
+            kb_id: Knowledge base ID
+        """
+        if not self.enabled:
+            return
+        await self.refresh()
+        blob = await self._get_client().hget(KB_RECORDS_KEY, kb_id)
+        if blob is not None:
+            if self._blobs.get(kb_id) != blob:
+                self.store.put_row(orjson.loads(blob))
+                self._blobs[kb_id] = blob
+        else:
+            self._blobs.pop(kb_id, None)
+            if kb_id in self.store:
+                self.store.delete(kb_id)
+
+    async def save(self, kb_id: str) -> None:
+        """
+        Write a record from the local store to Redis.
+
+        Args:
+            kb_id: Knowledge base ID
+        """
+        if not self.enabled:
+            return
+        blob = orjson.dumps(self.store.get_row(kb_id)).decode()
+        await self._get_client().hset(KB_RECORDS_KEY, kb_id, blob)
+        self._blobs[kb_id] = blob
+
+    async def remove(self, kb_id: str) -> None:
+        """
+        Delete a record from Redis.
+
+        Args:
+            kb_id: Knowledge base ID
+        """
+        if not self.enabled:
+            return
+        await self._get_client().hdel(KB_RECORDS_KEY, kb_id)
+        self._blobs.pop(kb_id, None)
+
+    async def close(self) -> None:
+        """Close the Redis connection pool if it was opened."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -0,0 +1,97 @@
+"""
+Knowledge Base Stats Cache
+
+In-process TTL cache for knowledge base statistics.
+
+Building stats scans the document store, but the result only changes when a
+knowledge base's documents are added or removed or the knowledge base is
+updated, imported or deleted. Entries expire after `KB_STATS_CACHE_TTL`
+seconds and are also dropped, per knowledge base, by the routers handling
+those writes through `invalidate(kb_id)`.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.config.settings import settings
+
+
+class KBStatsCache:
+    """
+    Per-knowledge-base cache of computed stats with a TTL.
+
+    Misses are computed under a per-knowledge-base lock, so concurrent requests
+    for the same stats trigger a single computation while misses for different
+    knowledge bases proceed independently.
+    """
+
+    def __init__(self, ttl: float):
+        """
+        Initialize an empty cache.
+
+        Args:
+            ttl: Seconds a cached entry stays valid
+        """
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # Bumped on invalidation so a computation that overlaps one is not stored;
+        # per knowledge base, plus a global counter for invalidating everything
+        self._generations: Dict[str, int] = {}
+        self._generation = 0
+
+    def _lookup(self, kb_id: str) -> Optional[Any]:
+        """Return the cached value for a knowledge base if it has not expired."""
+        entry = self._entries.get(kb_id)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+        return None
+
+    async def get_or_compute(self, kb_id: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Get cached stats, computing and storing them on a miss.
+
+        Args:
+            kb_id: Knowledge base ID
+            compute: Coroutine function producing fresh stats
+
+        Returns:
+            Cached or freshly computed stats
+        """
+        value = self._lookup(kb_id)
+        if value is not None:
+            return value
+
+        lock = self._locks.get(kb_id)
+        if lock is None:
+            lock = self._locks[kb_id] = asyncio.Lock()
+        async with lock:
+            # Another request may have filled the entry while we waited
+            value = self._lookup(kb_id)
+            if value is not None:
+                return value
+
+            generation = (self._generation, self._generations.get(kb_id, 0))
+            value = await compute()
+            if generation == (self._generation, self._generations.get(kb_id, 0)):
+                self._entries[kb_id] = (time.monotonic(), value)
+            return value
+
+    def invalidate(self, kb_id: Optional[str] = None) -> None:
+        """
+        Drop cached stats.
+
+        Args:
+            kb_id: Knowledge base to invalidate, or None to invalidate all
+        """
+        if kb_id is None:
+            self._generation += 1
+            self._entries.clear()
+        else:
+            self._generations[kb_id] = self._generations.get(kb_id, 0) + 1
+            self._entries.pop(kb_id, None)
+
+
+# Global cache instance
+kb_stats_cache = KBStatsCache(ttl=settings.KB_STATS_CACHE_TTL)
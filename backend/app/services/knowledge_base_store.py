@@ -0,0 +1,179 @@
+"""
+Knowledge Base Store
+
+In-memory, column-oriented storage for knowledge base records.
+
+Each `KnowledgeBaseInfo` field is stored in its own list and rows are located
+through an ID-to-row index, so listing knowledge bases reads plain column
+values instead of materializing a Pydantic model per row. A `SortedList` of
+`(created_ts, id)` keeps the rows in creation order, so listing needs no sort.
+Times are stored as epoch seconds and formatted only when encoded.
+Single records are rebuilt as `KnowledgeBaseInfo` only when a handler asks
+for one.
+
+The orjson encoding of each row is cached until the row changes, so list and
+get responses are assembled from prebuilt bytes.
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+import orjson
+from sortedcontainers import SortedList
+
+from app.models.knowledge_base import KnowledgeBaseInfo
+from app.utils.timestamps import isoformat_utc
+
+# Column names, in KnowledgeBaseInfo field order
+FIELDS = tuple(KnowledgeBaseInfo.model_fields)
+
+# Columns included in API output as stored; timestamps are formatted separately
+_OUTPUT_FIELDS = tuple(
+    name for name, field in KnowledgeBaseInfo.model_fields.items() if not field.exclude
+)
+
+
+class KnowledgeBaseStore:
+    """
+    Knowledge base records stored as columns (structure of arrays).
+
+    `columns` maps each field name to a list of values and `index` maps a
+    knowledge base ID to its row. Deleting moves the last row into the freed
+    slot, so columns stay dense. Replace with a database in production.
+    """
+
+    def __init__(self):
+        """Initialize an empty knowledge base store."""
+        self.columns: Dict[str, List[Any]] = {field: [] for field in FIELDS}
+        self.index: Dict[str, int] = {}
+        self._by_created = SortedList()
+        self._json_cache: Dict[str, bytes] = {}
+
+    def __contains__(self, kb_id: str) -> bool:
+        return kb_id in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def create(self, kb_id: str, name: str, description: Optional[str] = None) -> KnowledgeBaseInfo:
+        """
+        Add a new, empty knowledge base.
+
+        Args:
+            kb_id: Unique knowledge base identifier
+            name: Knowledge base name
+            description: Optional description
+
+        Returns:
+            KnowledgeBaseInfo for the created knowledge base
+        """
+        now = time.time()
+        row = {
+            "id": kb_id,
+            "name": name,
+            "description": description,
+            "created_ts": now,
+            "updated_ts": now,
+            "document_count": 0,
+            "entity_count": 0,
+            "relationship_count": 0,
+            "status": "active",
+        }
+        self.put_row(row)
+        return KnowledgeBaseInfo.model_construct(**row)
+
+    def put_row(self, row: Dict[str, Any]) -> None:
+        """
+        Insert or replace a knowledge base from a full field dict.
+
+        Args:
+            row: Values for every field in `FIELDS`
+        """
+        kb_id = row["id"]
+        if kb_id in self.index:
+            self.delete(kb_id)
+        self.index[kb_id] = len(self.columns["id"])
+        for field in FIELDS:
+            self.columns[field].append(row[field])
+        self._by_created.add((row["created_ts"], kb_id))
+
+    def _row(self, position: int) -> Dict[str, Any]:
+        """Build the field dict for a row."""
+        return {field: self.columns[field][position] for field in FIELDS}
+
+    def get(self, kb_id: str) -> Optional[KnowledgeBaseInfo]:
+        """Get a knowledge base record, or None if it does not exist."""
+        position = self.index.get(kb_id)
+        if position is None:
+            return None
+        return KnowledgeBaseInfo.model_construct(**self._row(position))
+
+    def get_row(self, kb_id: str) -> Dict[str, Any]:
+        """Get all stored fields of an existing knowledge base."""
+        return self._row(self.index[kb_id])
+
+    def get_field(self, kb_id: str, field: str) -> Any:
+        """Get a single field of an existing knowledge base."""
+        return self.columns[field][self.index[kb_id]]
+
+    def update(self, kb_id: str, **changes: Any) -> None:
+        """
+        Update fields of an existing knowledge base.
+
+        Args:
+            kb_id: Unique knowledge base identifier
+            **changes: Field names and their new values
+        """
+        position = self.index[kb_id]
+        for field, value in changes.items():
+            self.columns[field][position] = value
+        self._json_cache.pop(kb_id, None)
+
+    def get_json(self, kb_id: str) -> bytes:
+        """
+        Get the JSON encoding of an existing knowledge base.
+
+        Args:
+            kb_id: Unique knowledge base identifier
+
+        Returns:
+            orjson-encoded record, cached until the record changes
+        """
+        encoded = self._json_cache.get(kb_id)
+        if encoded is None:
+            position = self.index[kb_id]
+            row = {field: self.columns[field][position] for field in _OUTPUT_FIELDS}
+            row["created_date"] = isoformat_utc(self.columns["created_ts"][position])
+            row["last_updated"] = isoformat_utc(self.columns["updated_ts"][position])
+            encoded = self._json_cache[kb_id] = orjson.dumps(row)
+        return encoded
+
+    def list_json_newest_first(self) -> bytes:
+        """Get a JSON array of all knowledge bases, newest first."""
+        return b"[" + b",".join(self.get_json(kb_id) for _, kb_id in reversed(self._by_created)) + b"]"
+
+    def delete(self, kb_id: str) -> bool:
+        """
+        Remove a knowledge base.
+
+        Args:
+            kb_id: Unique knowledge base identifier
+
+        Returns:
+            True if the knowledge base existed
+        """
+        position = self.index.pop(kb_id, None)
+        if position is None:
+            return False
+        self._by_created.remove((self.columns["created_ts"][position], kb_id))
+        self._json_cache.pop(kb_id, None)
+
+        # Move the last row into the freed slot so the columns stay dense
+        last = len(self.columns["id"]) - 1
+        if position != last:
+            for column in self.columns.values():
+                column[position] = column[last]
+            self.index[self.columns["id"][position]] = position
+        for column in self.columns.values():
+            column.pop()
+        return True
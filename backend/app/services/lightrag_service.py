@@ -10,23 +10,31 @@ Key Features:
 - Pipeline status initialization
 - Graph-based knowledge retrieval
 - Incremental document updates
+- Redis-backed caching of query responses
 """
 
 import os
+import time
 import asyncio
-import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 from pathlib import Path
 
+from loguru import logger
+
 # Official LightRAG imports following their documentation
 from lightrag import LightRAG, QueryParam
 from lightrag.llm.openai import gpt_4o_mini_complete, openai_embed
 from lightrag.kg.shared_storage import initialize_pipeline_status
 from lightrag.utils import setup_logger
 
+from app.services.query_cache import query_cache
+
 # Setup LightRAG logger as per official documentation
 setup_logger("lightrag", level="INFO")
-logger = logging.getLogger(__name__)
+
+# Seconds a working directory snapshot is reused by get_stats
+STATS_CACHE_TTL = 5.0
+
 
 class LightRAGService:
     """
@@ -42,11 +50,12 @@ class LightRAGService:
         self.working_dir = os.path.abspath("./backend/lightrag_data")
         self.rag: Optional[LightRAG] = None
         self._initialized = False
+        # Serializes the first initialization so concurrent callers build one LightRAG
+        self._init_lock = asyncio.Lock()
+        # (monotonic time, stats) of the last working directory scan
+        self._stats_cache: Optional[Tuple[float, Dict[str, Any]]] = None
         
-        # Ensure working directory exists
-        os.makedirs(self.working_dir, exist_ok=True)
-        
-        logger.info(f"🚀 LightRAG Service initialized with working_dir: {self.working_dir}")
+        logger.info("🚀 LightRAG Service initialized with working_dir: {}", self.working_dir)
     
     async def initialize(self) -> bool:
         """
@@ -55,16 +64,29 @@ class LightRAGService:
         Based on official documentation:
         https://github.com/HKUDS/LightRAG#a-simple-program
         
+        Safe to call concurrently: the first caller initializes under a lock and
+        the others wait for it. Once initialized, this returns immediately.
+        
         Returns:
             bool: True if initialization successful, False otherwise
         """
-        if self._initialized and self.rag:
-            logger.info("✅ LightRAG already initialized")
+        if self._initialized:
             return True
-            
+        
+        async with self._init_lock:
+            # Another caller may have finished initializing while we waited
+            if self._initialized:
+                return True
+            return await self._initialize_locked()
+    
+    async def _initialize_locked(self) -> bool:
+        """Run the LightRAG initialization steps; the caller holds `_init_lock`."""
         try:
             logger.info("🔧 Initializing LightRAG with official pattern...")
             
+            # Ensure working directory exists (off the event loop)
+            await asyncio.to_thread(os.makedirs, self.working_dir, exist_ok=True)
+            
             # Step 1: Create LightRAG instance with official configuration
             self.rag = LightRAG(
                 working_dir=self.working_dir,
@@ -88,17 +110,24 @@ class LightRAGService:
             return True
             
         except Exception as e:
-            logger.error(f"❌ LightRAG initialization failed: {e}")
+            logger.error("❌ LightRAG initialization failed: {}", e)
             logger.exception("Full initialization error traceback:")
+            # Release any storages that were opened before the failure
+            if self.rag is not None:
+                try:
+                    await self.rag.finalize_storages()
+                except Exception as cleanup_error:
+                    logger.warning("⚠️ Failed to finalize partially initialized storages: {}", cleanup_error)
             self.rag = None
             self._initialized = False
             return False
     
-    async def insert_document(self, content: str, document_id: str) -> bool:
+    async def insert_document(self, rag: LightRAG, content: str, document_id: str) -> bool:
         """
         Insert a document into LightRAG using official pattern.
         
         Args:
+            rag: Initialized LightRAG instance (see `app.dependencies.get_rag`)
             content: Document text content
             document_id: Unique document identifier
             
@@ -106,28 +135,61 @@ class LightRAGService:
             bool: True if successful, False otherwise
         """
         try:
-            # Ensure LightRAG is initialized
-            if not await self.initialize():
-                logger.error("❌ Cannot insert document - LightRAG initialization failed")
-                return False
-            
-            logger.info(f"📄 Inserting document: {document_id}")
-            logger.info(f"   • Content length: {len(content):,} characters")
+            logger.info("📄 Inserting document: {} ({:,} characters)", document_id, len(content))
             
             # Use official LightRAG async insert method to avoid event loop conflicts
             # This handles all the graph construction, entity extraction, etc.
-            await self.rag.ainsert(content)
+            await rag.ainsert(content, ids=document_id)
+            await query_cache.invalidate()
             
-            logger.info(f"✅ Document {document_id} inserted successfully")
+            logger.info("✅ Document {} inserted successfully", document_id)
             return True
             
         except Exception as e:
-            logger.error(f"❌ Failed to insert document {document_id}: {e}")
+            logger.error("❌ Failed to insert document {}: {}", document_id, e)
             logger.exception("Full insert error traceback:")
             return False
     
+    async def insert_documents(self, rag: LightRAG, items: List[Tuple[str, str]]) -> List[bool]:
+        """
+        Insert several documents into LightRAG in one batch.
+        
+        LightRAG's `ainsert` accepts a list of texts and processes them in a
+        single pipeline run, so bulk inserts initialize and flush storage once.
+        The document IDs are passed along, so LightRAG's documents match the
+        document store's and no document is silently deduplicated by content.
+        
+        Args:
+            rag: Initialized LightRAG instance (see `app.dependencies.get_rag`)
+            items: (content, document_id) pairs
+            
+        Returns:
+            List of per-document success flags, in input order. The batch is
+            all-or-nothing: either every flag is True or every flag is False.
+        """
+        if not items:
+            return []
+        
+        try:
+            logger.info("📄 Inserting batch of {} documents", len(items))
+            
+            await rag.ainsert(
+                [content for content, _ in items],
+                ids=[document_id for _, document_id in items]
+            )
+            await query_cache.invalidate()
+            
+            logger.info("✅ Batch of {} documents inserted successfully", len(items))
+            return [True] * len(items)
+            
+        except Exception as e:
+            logger.error("❌ Failed to insert batch of {} documents: {}", len(items), e)
+            logger.exception("Full batch insert error traceback:")
+            return [False] * len(items)
+    
     async def query_knowledge_graph(
         self, 
+        rag: LightRAG,
         query: str, 
         mode: str = "hybrid",
         **kwargs
@@ -135,7 +197,12 @@ class LightRAGService:
         """
         Query the LightRAG knowledge graph using official pattern.
         
+        Successful responses are cached in Redis (see `query_cache`), so a
+        repeated query with the same mode is answered without calling the LLM
+        until documents are inserted. Error messages are never cached.
+        
         Args:
+            rag: Initialized LightRAG instance (see `app.dependencies.get_rag`)
             query: User query string
             mode: Query mode - "local", "global", "hybrid", "naive", "mix"
             **kwargs: Additional query parameters
@@ -144,24 +211,27 @@ class LightRAGService:
             str: Generated response or error message
         """
         try:
-            # Ensure LightRAG is initialized
-            if not await self.initialize():
-                logger.error("❌ Cannot query - LightRAG initialization failed")
-                return "I apologize, but the knowledge system is not available right now."
+            # Read once so the response below is stored under the generation it was computed for
+            generation = await query_cache.generation()
+            cached = await query_cache.get(query, mode, generation)
+            if cached is not None:
+                logger.info("⚡ Query cache hit for mode '{}'", mode)
+                return cached
             
-            logger.info(f"🔍 Querying LightRAG with mode '{mode}': {query[:100]}...")
+            logger.info("🔍 Querying LightRAG with mode '{}': {}...", mode, query[:100])
             
             # Create QueryParam with official pattern
             query_param = QueryParam(mode=mode)
             
             # Use official async query method (aquery for proper async operation)
-            response = await self.rag.aquery(query, param=query_param)
+            response = await rag.aquery(query, param=query_param)
             
-            logger.info(f"✅ Query completed successfully (response length: {len(response)} chars)")
+            logger.info("✅ Query completed successfully (response length: {} chars)", len(response))
+            await query_cache.set(query, mode, generation, response)
             return response
             
         except Exception as e:
-            logger.error(f"❌ Query failed: {e}")
+            logger.error("❌ Query failed: {}", e)
             logger.exception("Full query error traceback:")
             return f"I encountered an error while processing your query: {str(e)}"
     
@@ -169,26 +239,52 @@ class LightRAGService:
         """
         Get statistics about the LightRAG knowledge base.
         
+        The working directory scan runs in a worker thread and is reused for
+        `STATS_CACHE_TTL` seconds.
+        
         Returns:
-            Dict containing system statistics
+            Dict containing system statistics, including `cache_size` in bytes
         """
         try:
-            stats = {
-                "initialized": self._initialized,
-                "working_dir": self.working_dir,
-                "working_dir_exists": os.path.exists(self.working_dir),
-                "files_in_working_dir": [],
-            }
-            
-            if os.path.exists(self.working_dir):
-                stats["files_in_working_dir"] = os.listdir(self.working_dir)
+            cached = self._stats_cache
+            if cached is None or time.monotonic() - cached[0] >= STATS_CACHE_TTL:
+                cached = (time.monotonic(), await asyncio.to_thread(self._collect_stats))
+                self._stats_cache = cached
             
-            return stats
+            return {"initialized": self._initialized, **cached[1]}
             
         except Exception as e:
-            logger.error(f"❌ Failed to get stats: {e}")
+            logger.error("❌ Failed to get stats: {}", e)
             return {"error": str(e)}
     
+    def _collect_stats(self) -> Dict[str, Any]:
+        """
+        Scan the working directory, listing files and summing their sizes.
+        
+        Uses `os.scandir` so names and sizes come from a single pass.
+        
+        Returns:
+            Dict with working directory details and total `cache_size` in bytes
+        """
+        files = []
+        cache_size = 0
+        try:
+            with os.scandir(self.working_dir) as entries:
+                for entry in entries:
+                    files.append(entry.name)
+                    if entry.is_file():
+                        cache_size += entry.stat().st_size
+            exists = True
+        except FileNotFoundError:
+            exists = False
+        
+        return {
+            "working_dir": self.working_dir,
+            "working_dir_exists": exists,
+            "files_in_working_dir": files,
+            "cache_size": cache_size,
+        }
+    
     async def finalize(self):
         """
         Properly finalize LightRAG following official pattern.
@@ -203,7 +299,7 @@ class LightRAGService:
                 self._initialized = False
                 logger.info("✅ LightRAG finalized successfully")
         except Exception as e:
-            logger.error(f"❌ Error during finalization: {e}")
+            logger.error("❌ Error during finalization: {}", e)
 
 # Global service instance following singleton pattern
 lightrag_service = LightRAGService()
@@ -213,13 +309,17 @@ async def initialize_lightrag() -> bool:
     """Initialize the global LightRAG service."""
     return await lightrag_service.initialize()
 
-async def insert_document(content: str, document_id: str) -> bool:
-    """Insert a document into the global LightRAG service."""
-    return await lightrag_service.insert_document(content, document_id)
+async def insert_document(rag: LightRAG, content: str, document_id: str) -> bool:
+    """Insert a document through the global LightRAG service."""
+    return await lightrag_service.insert_document(rag, content, document_id)
+
+async def insert_documents(rag: LightRAG, items: List[Tuple[str, str]]) -> List[bool]:
+    """Insert a batch of documents through the global LightRAG service."""
+    return await lightrag_service.insert_documents(rag, items)
 
-async def query_knowledge_graph(query: str, mode: str = "hybrid") -> str:
-    """Query the global LightRAG knowledge graph."""
-    return await lightrag_service.query_knowledge_graph(query, mode)
+async def query_knowledge_graph(rag: LightRAG, query: str, mode: str = "hybrid") -> str:
+    """Query the knowledge graph through the global LightRAG service."""
+    return await lightrag_service.query_knowledge_graph(rag, query, mode)
 
 async def get_lightrag_stats() -> Dict[str, Any]:
     """Get statistics from the global LightRAG service."""
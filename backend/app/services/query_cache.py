@@ -0,0 +1,145 @@
+"""
+Query Cache Service
+
+Redis-backed cache for knowledge graph query responses.
+
+LLM-backed queries take seconds; repeated questions are answered from Redis
+instead. Entries are keyed by a BLAKE2b digest of the cache generation, query
+mode and text and expire after `CACHE_TTL` seconds. The generation is a Redis
+counter bumped by `invalidate()` whenever documents are inserted, so answers
+computed before an insert are never served again (they simply expire).
+Caching is controlled by `ENABLE_QUERY_CACHE`. Redis failures, including the
+short connect and command timeouts from settings, are logged and treated as
+cache misses so queries still work when Redis is slow or unavailable.
+"""
+
+import hashlib
+from typing import Optional
+
+import redis.asyncio as redis
+from loguru import logger
+from redis.exceptions import RedisError
+
+from app.config.settings import settings
+
+# Redis key namespace for cached chat responses
+CACHE_KEY_PREFIX = "chat:"
+
+# Counter that is part of every entry key; incrementing it invalidates all entries
+GENERATION_KEY = CACHE_KEY_PREFIX + "generation"
+
+
+class QueryCache:
+    """
+    Cache of query responses stored in Redis with a TTL.
+
+    The Redis client is created on first use, so importing this module does
+    not open any connections.
+    """
+
+    def __init__(self):
+        """Initialize the cache without connecting to Redis."""
+        self._client: Optional[redis.Redis] = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether query caching is enabled in settings."""
+        return settings.ENABLE_QUERY_CACHE
+
+    def _get_client(self) -> redis.Redis:
+        """Get the Redis client, creating it on first use."""
+        if self._client is None:
+            config = dict(settings.redis_config)
+            self._client = redis.from_url(config.pop("url"), **config)
+        return self._client
+
+    @staticmethod
+    def make_key(query: str, mode: str, generation: int) -> str:
+        """
+        Build the cache key for a query.
+
+        Args:
+            query: User query string
+            mode: Query mode
+            generation: Cache generation from `generation()`
+
+        Returns:
+            Redis key for the cached response
+        """
+        digest = hashlib.blake2b(f"{generation}|{mode}|{query}".encode(), digest_size=16).hexdigest()
+        return CACHE_KEY_PREFIX + digest
+
+    async def generation(self) -> Optional[int]:
+        """
+        Read the current cache generation.
+
+        Callers read it once per query and pass it to both `get()` and `set()`,
+        so a response computed before an invalidation is stored under the old,
+        unreachable generation.
+
+        Returns:
+            Current generation, or None when disabled or on Redis errors
+        """
+        if not self.enabled:
+            return None
+        try:
+            return int(await self._get_client().get(GENERATION_KEY) or 0)
+        except (RedisError, OSError) as e:
+            logger.warning("⚠️ Query cache generation lookup failed: {}", e)
+            return None
+
+    async def get(self, query: str, mode: str, generation: Optional[int]) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            query: User query string
+            mode: Query mode
+            generation: Cache generation from `generation()`, or None to skip
+
+        Returns:
+            Cached response, or None on a miss, when disabled or on Redis errors
+        """
+        if generation is None:
+            return None
+        try:
+            return await self._get_client().get(self.make_key(query, mode, generation))
+        except (RedisError, OSError) as e:
+            logger.warning("⚠️ Query cache lookup failed: {}", e)
+            return None
+
+    async def set(self, query: str, mode: str, generation: Optional[int], response: str) -> None:
+        """
+        Store a response with the configured TTL.
+
+        Args:
+            query: User query string
+            mode: Query mode
+            generation: Cache generation read before the query ran, or None to skip
+            response: Generated response to cache
+        """
+        if generation is None:
+            return
+        try:
+            await self._get_client().setex(self.make_key(query, mode, generation), settings.CACHE_TTL, response)
+        except (RedisError, OSError) as e:
+            logger.warning("⚠️ Query cache store failed: {}", e)
+
+    async def invalidate(self) -> None:
+        """Make every cached response unreachable, after the knowledge graph changed."""
+        if not self.enabled:
+            return
+        try:
+            await self._get_client().incr(GENERATION_KEY)
+        except (RedisError, OSError) as e:
+            logger.warning("⚠️ Query cache invalidation failed: {}", e)
+
+    async def close(self) -> None:
+        """Close the Redis connection pool if it was opened."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Global cache instance
+query_cache = QueryCache()
@@ -11,18 +11,93 @@ Features:
 - Error handling and fallback methods
 """
 
-import logging
+import codecs
 import io
 import re
-from typing import Union
+from typing import List, Union
 from pathlib import Path
 
 # Document processing libraries
+import charset_normalizer
 import docx
-import PyPDF2
 import pdfplumber
+import pypdf
+import pypdfium2 as pdfium
+from loguru import logger
 
-logger = logging.getLogger(__name__)
+# Patterns used by clean_text, compiled once at import
+_RE_BLANK_LINES = re.compile(r'\n\s*\n')
+# Only runs of two or more spaces, so single spaces are not rewritten with themselves
+_RE_MULTI_SPACE = re.compile(r' {2,}')
+
+# Byte order marks and the BOM-less codec for the text after them (UTF-32
+# first, since its little-endian mark starts with the UTF-16 one)
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF32_LE, 'utf-32-le'),
+    (codecs.BOM_UTF32_BE, 'utf-32-be'),
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+)
+
+# Bytes of a text file sampled for encoding detection
+ENCODING_SAMPLE_SIZE = 64 * 1024
+
+# Extractions shorter than this are rejected as empty or failed
+MIN_EXTRACTED_TEXT_LENGTH = 10
+
+# Control characters stripped by clean_text (everything below 0x20 except
+# tab, newline and carriage return, plus DEL), as a str.translate table
+_CTRL_TABLE = dict.fromkeys(
+    [*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F]
+)
+# The same characters as bytes, for deleting them before decoding
+_CTRL_BYTES = bytes(_CTRL_TABLE)
+
+
+def _extract_pdf_pages_with_pdfium(file_content: bytes) -> List[str]:
+    """
+    Extract the text of every PDF page with PDFium.
+    
+    Args:
+        file_content: PDF file content as bytes
+        
+    Returns:
+        Text of each page in order (empty string for pages without text)
+    """
+    pdf = pdfium.PdfDocument(file_content)
+    try:
+        texts = []
+        for page in pdf:
+            textpage = page.get_textpage()
+            # PDFium separates lines with CRLF
+            texts.append(textpage.get_text_bounded().replace("\r\n", "\n"))
+            textpage.close()
+            page.close()
+        return texts
+    finally:
+        pdf.close()
+
+def _extract_pdf_pages_with_pdfplumber(buffer: io.BytesIO) -> List[str]:
+    """
+    Extract the text of every PDF page with pdfplumber.
+    
+    Pages are processed one at a time and closed right after, so their
+    cached layout objects do not pile up on long documents. This already
+    runs in an upload extraction worker process, so no further pool is used.
+    
+    Args:
+        buffer: Seekable buffer over the PDF file content (left open)
+        
+    Returns:
+        Text of each page in order (empty string for pages without text)
+    """
+    texts = []
+    with pdfplumber.open(buffer) as pdf:
+        for page in pdf.pages:
+            texts.append(page.extract_text() or "")
+            page.close()
+    return texts
 
 def extract_text_from_pdf(file_content: bytes) -> str:
     """
@@ -38,35 +113,54 @@ def extract_text_from_pdf(file_content: bytes) -> str:
         Exception: If PDF extraction fails completely
     """
     try:
-        text = ""
+        # One buffer shared by the pure-Python fallbacks
+        buffer = io.BytesIO(file_content)
         
-        # Try with pdfplumber first (better for complex layouts)
+        # Try with PDFium first (native, much faster than the pure-Python parsers)
         try:
-            with pdfplumber.open(io.BytesIO(file_content)) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+            text = "\n".join(filter(None, _extract_pdf_pages_with_pdfium(file_content))).strip()
             
-            if text.strip():
-                logger.info(f"Successfully extracted text from PDF using pdfplumber ({len(text)} chars)")
-                return text.strip()
+            if text:
+                logger.info("Successfully extracted text from PDF using pypdfium2 ({} chars)", len(text))
+                return text
         except Exception as e:
-            logger.warning(f"pdfplumber extraction failed: {e}")
+            logger.warning("pypdfium2 extraction failed: {}", e)
         
-        # Fallback to PyPDF2
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
+        # Fallback to pdfplumber (better for complex layouts)
+        page_texts = None
+        try:
+            page_texts = _extract_pdf_pages_with_pdfplumber(buffer)
+            
+            if all(page_texts):
+                text = "\n".join(page_texts).strip()
+                if text:
+                    logger.info("Successfully extracted text from PDF using pdfplumber ({} chars)", len(text))
+                    return text
+        except Exception as e:
+            logger.warning("pdfplumber extraction failed: {}", e)
+        
+        # Fallback to pypdf, only for the pages pdfplumber returned no text for
+        buffer.seek(0)
+        pdf_reader = pypdf.PdfReader(buffer)
+        if page_texts is None:
+            page_texts = [""] * len(pdf_reader.pages)
+        
+        missing = [i for i, page_text in enumerate(page_texts) if not page_text.strip() and i < len(pdf_reader.pages)]
+        for i in missing:
+            page_texts[i] = pdf_reader.pages[i].extract_text()
+        text = "\n".join(filter(None, page_texts)).strip()
         
-        if not text.strip():
+        if not text:
             raise Exception("No text could be extracted from the PDF")
         
-        logger.info(f"Successfully extracted text from PDF using PyPDF2 ({len(text)} chars)")
-        return text.strip()
+        logger.info(
+            "Successfully extracted text from PDF using pypdf for {} of {} pages ({} chars)",
+            len(missing), len(page_texts), len(text)
+        )
+        return text
         
     except Exception as e:
-        logger.error(f"Failed to extract text from PDF: {e}")
+        logger.error("Failed to extract text from PDF: {}", e)
         raise Exception(f"PDF text extraction failed: {e}")
 
 def extract_text_from_docx(file_content: bytes) -> str:
@@ -84,68 +178,97 @@ def extract_text_from_docx(file_content: bytes) -> str:
     """
     try:
         doc = docx.Document(io.BytesIO(file_content))
-        text = ""
         
         # Extract text from paragraphs
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
+        paragraphs_text = "\n".join(paragraph.text for paragraph in doc.paragraphs)
+        
+        # Extract text from tables, one line per row
+        tables_text = "\n".join(
+            " ".join(cell.text for cell in row.cells)
+            for table in doc.tables
+            for row in table.rows
+        )
         
-        # Extract text from tables
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    text += cell.text + " "
-                text += "\n"
+        text = f"{paragraphs_text}\n{tables_text}".strip()
         
-        if not text.strip():
+        if not text:
             raise Exception("No text could be extracted from the Word document")
         
-        logger.info(f"Successfully extracted text from DOCX ({len(text)} chars)")
-        return text.strip()
+        logger.info("Successfully extracted text from DOCX ({} chars)", len(text))
+        return text
         
     except Exception as e:
-        logger.error(f"Failed to extract text from DOCX: {e}")
+        logger.error("Failed to extract text from DOCX: {}", e)
         raise Exception(f"DOCX text extraction failed: {e}")
 
 def extract_text_from_txt(file_content: bytes) -> str:
     """
     Extract text content from plain text file bytes.
+    
+    Control characters are removed here, where it is cheapest, so
+    `clean_text` does not need to strip them again.
      
     Args:
         file_content: Text file content as bytes
         
     Returns:
-        Extracted text content
+        Extracted text content without control characters
         
     Raises:
         Exception: If text extraction fails
     """
     try:
-        # Try different encodings
-        encodings = ['utf-8', 'utf-16', 'latin-1', 'cp1252']
-        
-        for encoding in encodings:
-            try:
-                text = file_content.decode(encoding)
-                    
-                if text.strip():
-                    logger.info(f"Successfully extracted text from TXT using {encoding} ({len(text)} chars)")
-                    return text.strip()
-            except UnicodeDecodeError:
-                continue
-        
-        raise Exception("Could not decode text file with any supported encoding")
+        # A byte order mark settles the encoding; it is sliced off so that a
+        # BOM-only file yields "" rather than a stray U+FEFF from detection
+        for bom, encoding in _BOM_ENCODINGS:
+            if file_content.startswith(bom):
+                text = file_content[len(bom):].decode(encoding, errors='replace').translate(_CTRL_TABLE).strip()
+                logger.info("Successfully extracted text from TXT using {} ({} chars)", encoding, len(text))
+                return text
+        
+        # Control characters are single bytes in UTF-8 and cp1252 that never occur
+        # inside multi-byte sequences, so for those they are deleted before decoding
+        stripped_content = file_content.translate(None, _CTRL_BYTES)
+        
+        # Most text files are UTF-8, so try it before running detection
+        try:
+            text = stripped_content.decode('utf-8').strip()
+            if text:
+                logger.info("Successfully extracted text from TXT using utf-8 ({} chars)", len(text))
+                return text
+        except UnicodeDecodeError:
+            pass
+        
+        # Detect the encoding from a prefix and decode once
+        best = charset_normalizer.from_bytes(file_content[:ENCODING_SAMPLE_SIZE]).best()
+        if best is not None:
+            # An ASCII-only prefix says nothing about the rest; decode as its UTF-8 superset
+            encoding = 'utf-8' if best.encoding == 'ascii' else best.encoding
+            text = file_content.decode(encoding, errors='replace').translate(_CTRL_TABLE).strip()
+            if text:
+                logger.info("Successfully extracted text from TXT using {} ({} chars)", encoding, len(text))
+                return text
+        
+        # Detection failed, fall back to Windows-1252, which decodes any bytes
+        text = stripped_content.decode('cp1252', errors='replace').strip()
+        if text:
+            logger.info("Successfully extracted text from TXT using cp1252 ({} chars)", len(text))
+            return text
+        
+        raise Exception("Text file contains no text")
         
     except Exception as e:
-        logger.error(f"Failed to extract text from TXT: {e}")
+        logger.error("Failed to extract text from TXT: {}", e)
         raise Exception(f"Text file extraction failed: {e}")
 
-def clean_text(text: str) -> str:
+def clean_text(text: str, strip_control_chars: bool = True) -> str:
     """
     Clean and preprocess extracted text.
     
     Args:
         text: Raw extracted text
+        strip_control_chars: Whether to remove control characters; extractors
+            that already removed them pass False
         
     Returns:
         Cleaned text content
@@ -155,18 +278,50 @@ def clean_text(text: str) -> str:
         cleaned = text.strip()
         
         # Remove excessive whitespace
-        cleaned = re.sub(r'\n\s*\n', '\n\n', cleaned)
-        cleaned = re.sub(r' +', ' ', cleaned)
+        cleaned = _RE_BLANK_LINES.sub('\n\n', cleaned)
+        # A substring check is much cheaper than the regex scan, and most
+        # extracted text has no double spaces at all
+        if '  ' in cleaned:
+            cleaned = _RE_MULTI_SPACE.sub(' ', cleaned)
         
         # Remove control characters except newlines and tabs
-        cleaned = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', cleaned)
+        if strip_control_chars:
+            cleaned = cleaned.translate(_CTRL_TABLE)
         
         return cleaned
         
     except Exception as e:
-        logger.warning(f"Text cleaning failed: {e}, returning original text")
+        logger.warning("Text cleaning failed: {}, returning original text", e)
         return text
 
+def _ext(filename: str) -> str:
+    """
+    Get the lower-cased extension of a file name.
+    
+    Same result as `Path(filename).suffix.lower()` for POSIX-style names,
+    without constructing a path object.
+    
+    Args:
+        filename: File name, optionally with leading directories
+        
+    Returns:
+        Extension including the dot, or an empty string if there is none
+    """
+    dot = filename.rfind('.')
+    # No dot in the final component, a leading-dot name or a trailing dot
+    if dot <= filename.rfind('/') + 1 or dot == len(filename) - 1:
+        return ''
+    return filename[dot:].lower()
+
+# Extraction function for each supported file extension
+_EXTRACTORS = {
+    '.pdf': extract_text_from_pdf,
+    '.docx': extract_text_from_docx,
+    '.txt': extract_text_from_txt,
+    '.md': extract_text_from_txt,
+}
+_SUPPORTED_EXTENSIONS = frozenset(_EXTRACTORS)
+
 def extract_text_from_file(file_content: bytes, filename: str) -> str:
     """
     Extract text from various file formats.
@@ -182,34 +337,58 @@ def extract_text_from_file(file_content: bytes, filename: str) -> str:
         Exception: If extraction fails or file type is unsupported
     """
     try:
-        file_extension = Path(filename).suffix.lower()
+        file_extension = _ext(filename)
         
-        logger.info(f"Extracting text from {filename} (extension: {file_extension})")
+        logger.info("Extracting text from {} (extension: {})", filename, file_extension)
         
         # Route to appropriate extraction method
-        if file_extension == '.pdf':
-            raw_text = extract_text_from_pdf(file_content)
-        elif file_extension == '.docx':
-            raw_text = extract_text_from_docx(file_content)
-        elif file_extension in ['.txt', '.md']:
-            raw_text = extract_text_from_txt(file_content)
-        else:
+        extractor = _EXTRACTORS.get(file_extension)
+        if extractor is None:
             raise Exception(f"Unsupported file type: {file_extension}")
         
+        raw_text = extractor(file_content)
+        
+        # Cleaning only ever shortens the text, so reject short extractions before it runs
+        if len(raw_text) < MIN_EXTRACTED_TEXT_LENGTH:
+            raise Exception(f"Extracted text is too short (minimum {MIN_EXTRACTED_TEXT_LENGTH} characters required)")
+        
         # Clean and preprocess the extracted text
-        cleaned_text = clean_text(raw_text)
+        cleaned_text = clean_text(raw_text, strip_control_chars=extractor is not extract_text_from_txt)
         
-        logger.info(f"Text extraction completed: {len(cleaned_text)} characters")
+        logger.info("Text extraction completed: {} characters", len(cleaned_text))
         
-        if len(cleaned_text.strip()) < 10:
-            raise Exception("Extracted text is too short (minimum 10 characters required)")
+        # Cleaning may still collapse enough whitespace to drop below the minimum
+        if len(cleaned_text.strip()) < MIN_EXTRACTED_TEXT_LENGTH:
+            raise Exception(f"Extracted text is too short (minimum {MIN_EXTRACTED_TEXT_LENGTH} characters required)")
         
         return cleaned_text
         
     except Exception as e:
-        logger.error(f"Failed to extract text from {filename}: {e}")
+        logger.error("Failed to extract text from {}: {}", filename, e)
         raise Exception(f"Text extraction failed for {filename}: {e}")
 
+def extract_text_from_path(file_path: Union[str, Path], filename: str) -> str:
+    """
+    Extract text from a file stored on disk.
+    
+    Used for uploads that were streamed to a temporary file, so the file
+    bytes are only loaded by the code doing the extraction.
+    
+    Args:
+        file_path: Path to the file on disk
+        filename: Original name of the file (used to determine format)
+        
+    Returns:
+        Extracted and cleaned text content
+        
+    Raises:
+        Exception: If extraction fails or file type is unsupported
+    """
+    with open(file_path, "rb") as f:
+        file_content = f.read()
+    
+    return extract_text_from_file(file_content, filename)
+
 def get_supported_file_types() -> list:
     """
     Get list of supported file types for text extraction.
@@ -217,7 +396,7 @@ def get_supported_file_types() -> list:
     Returns:
         List of supported file extensions
     """
-    return ['.pdf', '.docx', '.txt', '.md']
+    return list(_EXTRACTORS)
 
 def is_supported_file_type(filename: str) -> bool:
     """
@@ -229,5 +408,5 @@ def is_supported_file_type(filename: str) -> bool:
     Returns:
         True if file type is supported, False otherwise
     """
-    file_extension = Path(filename).suffix.lower()
-    return file_extension in get_supported_file_types() 
\ No newline at end of file
+    file_extension = _ext(filename)
+    return file_extension in _SUPPORTED_EXTENSIONS 
\ No newline at end of file
@@ -5,6 +5,8 @@ This module sets up structured logging for the LightRAG Agent application
 using loguru for enhanced logging capabilities.
 """
 
+import inspect
+import logging
 import sys
 from pathlib import Path
 from loguru import logger
@@ -12,6 +14,30 @@ from loguru import logger
 from app.config.settings import settings
 
 
+class InterceptHandler(logging.Handler):
+    """
+    Forward standard library log records to loguru.
+    
+    Application code logs through loguru directly; this handler only exists so
+    third-party libraries that use `logging` end up in the same sinks.
+    """
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        # Map the stdlib level to a loguru level name when one exists
+        try:
+            level = logger.level(record.levelname).name
+        except ValueError:
+            level = record.levelno
+        
+        # Find the caller that issued the record so loguru reports its location
+        frame, depth = inspect.currentframe(), 0
+        while frame and (depth == 0 or frame.f_code.co_filename == logging.__file__):
+            frame = frame.f_back
+            depth += 1
+        
+        logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
+
+
 def setup_logging():
     """
     Configure loguru logger with appropriate settings for the application.
@@ -21,18 +47,29 @@ def setup_logging():
     - Sets up console logging with colors and formatting
     - Sets up file logging if configured
     - Configures log levels and filtering
+    - Routes standard library logging (third-party libraries) into loguru
+    
+    Both sinks are enqueued: records are handed to a background writer so
+    callers never block on console or disk I/O (including log rotation).
     """
     # Remove default loguru handler
     logger.remove()
     
+    level = settings.LOG_LEVEL.upper()
+    
+    # Extended tracebacks with local variable values are costly to build on
+    # every logged exception, so only enable them when debugging
+    debug = level == "DEBUG"
+    
     # Console logging configuration
     logger.add(
         sys.stdout,
         format=settings.LOG_FORMAT,
-        level=settings.LOG_LEVEL.upper(),
+        level=level,
         colorize=True,
-        backtrace=True,
-        diagnose=True
+        enqueue=True,
+        backtrace=debug,
+        diagnose=debug
     )
     
     # File logging configuration (if specified)
@@ -46,18 +83,27 @@ def setup_logging():
         logger.add(
             str(log_file_path),
             format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-            level=settings.LOG_LEVEL.upper(),
+            level=level,
             rotation="10 MB",  # Rotate when file reaches 10MB
             retention="30 days",  # Keep logs for 30 days
             compression="zip",  # Compress rotated logs
-            backtrace=True,
-            diagnose=True
+            enqueue=True,
+            backtrace=debug,
+            diagnose=debug
         )
     
+    # Route stdlib logging through loguru; the root level filters records
+    # before they are formatted or dispatched
+    logging.basicConfig(
+        handlers=[InterceptHandler()],
+        level=level,
+        force=True
+    )
+    
     # Log startup message
-    logger.info(f"Logging initialized - Level: {settings.LOG_LEVEL}")
+    logger.info("Logging initialized - Level: {}", settings.LOG_LEVEL)
     if settings.LOG_FILE:
-        logger.info(f"Log file: {settings.LOG_FILE}")
+        logger.info("Log file: {}", settings.LOG_FILE)
 
 
 def get_logger(name: str):
@@ -0,0 +1,43 @@
+"""
+Response Classes
+
+Custom FastAPI response classes used by the API routers.
+"""
+
+from typing import Any
+
+import msgspec
+import orjson
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel
+
+
+class MsgspecJSONResponse(JSONResponse):
+    """
+    JSON response rendered with msgspec's encoder instead of `json.dumps`.
+
+    Use as `response_class=` on endpoints that return large or list-shaped
+    payloads; FastAPI hands `render` the already-validated response content.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return msgspec.json.encode(content)
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Serialize Pydantic models for orjson; datetime and UUID are handled natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class ModelORJSONResponse(ORJSONResponse):
+    """
+    orjson response that accepts Pydantic models anywhere in its content.
+
+    Return it directly from a handler to skip FastAPI's response validation and
+    `jsonable_encoder` pass; models are dumped by orjson's `default` hook.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,21 @@
+"""
+Timestamp Utilities
+
+Helpers for storing times as epoch seconds and formatting them only when
+they are serialized for API responses.
+"""
+
+from datetime import datetime, timezone
+
+
+def isoformat_utc(timestamp: float) -> str:
+    """
+    Format an epoch timestamp as an ISO 8601 string in UTC.
+
+    Args:
+        timestamp: Seconds since the epoch (as returned by `time.time()`)
+
+    Returns:
+        ISO 8601 formatted timestamp with a UTC offset
+    """
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
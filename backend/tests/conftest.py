@@ -0,0 +1,6 @@
+"""Shared test setup."""
+
+import os
+
+# Settings are loaded when app modules are imported and require an API key
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
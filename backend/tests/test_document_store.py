@@ -0,0 +1,42 @@
+"""Tests for the document store's per-knowledge-base bookkeeping."""
+
+from app.models.documents import DocumentInfo
+from app.services.document_store import DocumentStore
+
+
+def _doc(document_id, kb_id, status="completed"):
+    return DocumentInfo.model_construct(
+        id=document_id,
+        filename=f"{document_id}.txt",
+        content_type="text/plain",
+        size=5,
+        text_length=5,
+        status=status,
+        upload_time=0.0,
+        kb_id=kb_id
+    )
+
+
+def test_changed_kbs_track_completion_and_deletion():
+    store = DocumentStore()
+    store.put(_doc("a", "kb1", status="processing"), "hello")
+    assert store.pop_changed_kbs() == set()
+
+    store.set_status("a", "completed")
+    assert store.pop_changed_kbs() == {"kb1"}
+    assert store.pop_changed_kbs() == set()
+
+    store.delete("a")
+    assert store.pop_changed_kbs() == {"kb1"}
+    assert store.aggregate("kb1").doc_count == 0
+
+
+def test_changed_kbs_include_evictions():
+    store = DocumentStore(max_documents=1)
+    store.put(_doc("a", "kb1"), "hello")
+    store.pop_changed_kbs()
+
+    store.put(_doc("b", "kb2"), "world")
+    assert store.pop_changed_kbs() == {"kb1", "kb2"}
+    assert store.aggregate("kb1").doc_count == 0
+    assert store.aggregate("kb2").doc_count == 1
@@ -0,0 +1,38 @@
+"""Tests for the character-bounded extraction cache."""
+
+from app.services.extraction_cache import ExtractionCache
+
+
+def test_hit_and_miss():
+    cache = ExtractionCache(max_chars=100)
+    cache.put(b"a", ".txt", "hello")
+    assert cache.get(b"a", ".txt") == "hello"
+    assert cache.get(b"a", ".md") is None
+    assert cache.get(b"b", ".txt") is None
+
+
+def test_evicts_least_recently_used_by_total_chars():
+    cache = ExtractionCache(max_chars=10)
+    cache.put(b"a", ".txt", "aaaa")
+    cache.put(b"b", ".txt", "bbbb")
+    cache.get(b"a", ".txt")
+    cache.put(b"c", ".txt", "cccc")
+    assert cache.get(b"b", ".txt") is None
+    assert cache.get(b"a", ".txt") == "aaaa"
+    assert cache.get(b"c", ".txt") == "cccc"
+
+
+def test_oversized_text_not_cached():
+    cache = ExtractionCache(max_chars=10)
+    cache.put(b"a", ".txt", "small")
+    cache.put(b"b", ".txt", "x" * 11)
+    assert cache.get(b"b", ".txt") is None
+    assert cache.get(b"a", ".txt") == "small"
+
+
+def test_replacing_entry_keeps_char_count():
+    cache = ExtractionCache(max_chars=10)
+    for _ in range(5):
+        cache.put(b"a", ".txt", "aaaaaa")
+    cache.put(b"b", ".txt", "bbbb")
+    assert len(cache) == 2
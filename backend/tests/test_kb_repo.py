@@ -0,0 +1,93 @@
+"""Tests for syncing the knowledge base store with Redis."""
+
+import asyncio
+
+import orjson
+import pytest
+
+from app.services.kb_repo import KBRepo
+from app.services.knowledge_base_store import KnowledgeBaseStore
+
+
+class FakeRedisHash:
+    """In-memory stand-in for the Redis hash commands the repository uses."""
+
+    def __init__(self):
+        self.fields = {}
+        self.hgetall_calls = 0
+
+    async def hgetall(self, key):
+        self.hgetall_calls += 1
+        return dict(self.fields)
+
+    async def hget(self, key, field):
+        return self.fields.get(field)
+
+    async def hset(self, key, field, value):
+        self.fields[field] = value
+
+    async def hdel(self, key, field):
+        self.fields.pop(field, None)
+
+
+@pytest.fixture
+def repo(monkeypatch):
+    monkeypatch.setattr(KBRepo, "enabled", property(lambda self: True))
+    kb_repo = KBRepo(KnowledgeBaseStore(), ttl=0)
+    kb_repo._client = FakeRedisHash()
+    return kb_repo
+
+
+def _write_remote(repo, kb_id, **changes):
+    """Simulate another worker changing a record in Redis."""
+    row = orjson.loads(repo._client.fields[kb_id])
+    row.update(changes)
+    repo._client.fields[kb_id] = orjson.dumps(row).decode()
+
+
+def test_refresh_keeps_cached_json_of_unchanged_records(repo):
+    async def scenario():
+        for kb_id in ("a", "b"):
+            repo.store.create(kb_id, kb_id)
+            await repo.save(kb_id)
+        await repo.refresh()
+        cached_a, cached_b = repo.store.get_json("a"), repo.store.get_json("b")
+
+        _write_remote(repo, "b", name="renamed")
+        await repo.refresh()
+
+        assert repo.store.get_json("a") is cached_a
+        assert repo.store.get_json("b") is not cached_b
+        assert repo.store.get("b").name == "renamed"
+
+    asyncio.run(scenario())
+
+
+def test_refresh_drops_records_removed_from_redis_only(repo):
+    async def scenario():
+        repo.store.create("a", "a")
+        await repo.save("a")
+        await repo.refresh()
+
+        # Created locally, not saved yet
+        repo.store.create("pending", "pending")
+        del repo._client.fields["a"]
+        await repo.refresh()
+
+        assert "a" not in repo.store
+        assert "pending" in repo.store
+
+    asyncio.run(scenario())
+
+
+def test_refresh_loads_records_from_other_workers(repo):
+    async def scenario():
+        other = KnowledgeBaseStore()
+        other.create("x", "x")
+        repo._client.fields["x"] = orjson.dumps(other.get_row("x")).decode()
+
+        await repo.refresh()
+
+        assert repo.store.get("x").name == "x"
+
+    asyncio.run(scenario())
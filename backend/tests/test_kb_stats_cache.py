@@ -0,0 +1,84 @@
+"""Tests for the per-knowledge-base stats cache."""
+
+import asyncio
+
+from app.services.kb_stats_cache import KBStatsCache
+
+
+def test_misses_for_different_kbs_run_concurrently():
+    async def scenario():
+        cache = KBStatsCache(ttl=60)
+        release = asyncio.Event()
+        started = []
+
+        async def slow():
+            started.append("kb1")
+            await release.wait()
+            return "stats1"
+
+        async def fast():
+            started.append("kb2")
+            return "stats2"
+
+        slow_task = asyncio.create_task(cache.get_or_compute("kb1", slow))
+        await asyncio.sleep(0)
+        # kb1's computation is still running; kb2 must not wait for it
+        assert await asyncio.wait_for(cache.get_or_compute("kb2", fast), timeout=1) == "stats2"
+        release.set()
+        assert await slow_task == "stats1"
+        assert started == ["kb1", "kb2"]
+
+    asyncio.run(scenario())
+
+
+def test_invalidating_one_kb_keeps_in_flight_results_for_others():
+    async def scenario():
+        cache = KBStatsCache(ttl=60)
+        release = asyncio.Event()
+
+        async def compute_after_release(value):
+            await release.wait()
+            return value
+
+        kb1 = asyncio.create_task(cache.get_or_compute("kb1", lambda: compute_after_release("stats1")))
+        kb2 = asyncio.create_task(cache.get_or_compute("kb2", lambda: compute_after_release("stats2")))
+        await asyncio.sleep(0)
+        cache.invalidate("kb1")
+        release.set()
+        await asyncio.gather(kb1, kb2)
+
+        calls = []
+
+        async def recompute():
+            calls.append(1)
+            return "fresh"
+
+        # kb1's overlapping result was discarded, kb2's was stored
+        assert await cache.get_or_compute("kb1", recompute) == "fresh"
+        assert await cache.get_or_compute("kb2", recompute) == "stats2"
+        assert len(calls) == 1
+
+    asyncio.run(scenario())
+
+
+def test_invalidate_all_discards_every_in_flight_result():
+    async def scenario():
+        cache = KBStatsCache(ttl=60)
+        release = asyncio.Event()
+
+        async def compute_after_release():
+            await release.wait()
+            return "stale"
+
+        task = asyncio.create_task(cache.get_or_compute("kb1", compute_after_release))
+        await asyncio.sleep(0)
+        cache.invalidate()
+        release.set()
+        await task
+
+        async def fresh():
+            return "fresh"
+
+        assert await cache.get_or_compute("kb1", fresh) == "fresh"
+
+    asyncio.run(scenario())
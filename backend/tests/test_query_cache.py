@@ -0,0 +1,60 @@
+"""Tests for the Redis-backed query response cache."""
+
+import asyncio
+
+import pytest
+
+from app.services.query_cache import QueryCache
+
+
+class FakeRedis:
+    """In-memory stand-in for the few Redis commands the cache uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+
+@pytest.fixture
+def cache():
+    query_cache = QueryCache()
+    query_cache._client = FakeRedis()
+    return query_cache
+
+
+def test_cached_response_is_returned(cache):
+    async def scenario():
+        generation = await cache.generation()
+        await cache.set("question", "hybrid", generation, "answer")
+        return await cache.get("question", "hybrid", await cache.generation())
+
+    assert asyncio.run(scenario()) == "answer"
+
+
+def test_invalidate_hides_earlier_responses(cache):
+    async def scenario():
+        generation = await cache.generation()
+        await cache.set("question", "hybrid", generation, "stale answer")
+        await cache.invalidate()
+        return await cache.get("question", "hybrid", await cache.generation())
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_response_computed_before_invalidation_is_not_served(cache):
+    async def scenario():
+        generation = await cache.generation()
+        await cache.invalidate()
+        await cache.set("question", "hybrid", generation, "stale answer")
+        return await cache.get("question", "hybrid", await cache.generation())
+
+    assert asyncio.run(scenario()) is None
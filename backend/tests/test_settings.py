@@ -0,0 +1,42 @@
+"""Tests for loading settings from the environment."""
+
+import msgspec
+import pytest
+
+from app.config.settings import build_settings
+
+
+@pytest.fixture(autouse=True)
+def required_env(monkeypatch):
+    """Provide the settings that have no default."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("1", True), ("true", True), ("True", True), ("yes", True), ("YES", True), ("on", True), ("On", True),
+        ("0", False), ("false", False), ("FALSE", False), ("no", False), ("No", False), ("off", False), (" OFF ", False),
+    ],
+)
+def test_bool_settings_accept_common_spellings(monkeypatch, raw, expected):
+    monkeypatch.setenv("DEBUG", raw)
+    monkeypatch.setenv("ENABLE_QUERY_CACHE", raw)
+
+    settings = build_settings(env_file=None)
+
+    assert settings.DEBUG is expected
+    assert settings.ENABLE_QUERY_CACHE is expected
+
+
+def test_bool_settings_reject_unknown_values(monkeypatch):
+    monkeypatch.setenv("DEBUG", "maybe")
+
+    with pytest.raises(msgspec.ValidationError):
+        build_settings(env_file=None)
+
+
+def test_list_settings_accept_comma_separated_values(monkeypatch):
+    monkeypatch.setenv("ALLOWED_ORIGINS", "http://a.test, http://b.test")
+
+    assert build_settings(env_file=None).ALLOWED_ORIGINS == ["http://a.test", "http://b.test"]
@@ -0,0 +1,49 @@
+"""Tests for plain text extraction."""
+
+import codecs
+
+import pytest
+
+from app.services.text_extraction_service import extract_text_from_txt
+
+
+@pytest.mark.parametrize("bom", [
+    codecs.BOM_UTF8,
+    codecs.BOM_UTF16_LE,
+    codecs.BOM_UTF16_BE,
+    codecs.BOM_UTF32_LE,
+    codecs.BOM_UTF32_BE,
+])
+def test_bom_only_file_is_empty(bom):
+    assert extract_text_from_txt(bom) == ""
+
+
+@pytest.mark.parametrize("bom, encoding", [
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+])
+def test_bom_is_stripped(bom, encoding):
+    text = extract_text_from_txt(bom + "Grüße, world".encode(encoding))
+    assert text == "Grüße, world"
+
+
+def test_utf8_without_bom():
+    assert extract_text_from_txt("naïve café\n".encode("utf-8")) == "naïve café"
+
+
+def test_control_characters_removed():
+    assert extract_text_from_txt(b"abc\x00\x07def\tghi") == "abcdef\tghi"
+
+
+def test_non_utf8_bytes_still_decode():
+    text = extract_text_from_txt("Café au lait, s’il vous plaît".encode("cp1252"))
+    assert text.startswith("Caf") and text.endswith("t")
+    assert "\ufffd" not in text
+
+
+def test_whitespace_only_file_raises():
+    with pytest.raises(Exception, match="no text"):
+        extract_text_from_txt(b" \n\t ")